@@ -0,0 +1,46 @@
+# ---------------------------------------------------------------------------- #
+#                                 BFS Benchmark                                #
+# ---------------------------------------------------------------------------- #
+#
+# Compares the top-down BFS with the direction optimizing and numpy ones on
+# random graphs with a low diameter. Run from the repository root:
+#
+#   python -m benchmarks.bfs [vertices] [average degree]
+
+import random
+import sys
+import time
+import classes.Graph as Graph
+import classes.Search as Search
+
+# Random non directional graph with about vertices * degree / 2 edges.
+def random_graph(vertices, degree, seed = 1):
+    _random = random.Random(seed)
+    _graph = Graph.Graph(False, False)
+    _graph.vertices_add(str(i) for i in range(vertices))
+    _graph.edges_add((str(_random.randrange(vertices)), str(_random.randrange(vertices)), 1)
+                     for _ in range(vertices * degree // 2))
+    return _graph.freeze()
+
+def main():
+    _vertices = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    _degree = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    _view = random_graph(_vertices, _degree)
+    print(f"{_vertices} vertices, {_view.edge_count()} adjacency entries")
+
+    _reached = None
+    _modes = ["top_down", "direction_optimizing"]
+    if (Graph.np != None):
+        _modes.append("numpy")
+    for _mode in _modes:
+        _start = time.perf_counter()
+        _order = list(Search.bfs(_view, 0, _mode))
+        _elapsed = time.perf_counter() - _start
+        if (_reached == None):
+            _reached = set(_order)
+        elif (set(_order) != _reached):
+            print(f"{_mode}: reached a different set of vertices!")
+        print(f"{_mode:>22}: {_elapsed:.3f}s, {len(_order)} vertices reached")
+
+if __name__ == "__main__":
+    main()
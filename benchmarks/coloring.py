@@ -0,0 +1,188 @@
+# ---------------------------------------------------------------------------- #
+#                              Coloring Benchmark                              #
+# ---------------------------------------------------------------------------- #
+#
+# Runs every coloring algorithm over several graph families and sizes, checks
+# each coloring, and reports wall time, peak memory and colors used. Run from
+# the repository root:
+#
+#   python -m benchmarks.coloring [sizes] [results.json]
+#
+# sizes is a comma separated list of vertex counts (default 1000,10000,100000).
+# Peak memory is what tracemalloc sees in this process, measured on a second
+# run so it doesn't slow the timed one; Jones Plassmann's worker processes
+# aren't counted.
+
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import classes.Coloring as Coloring
+import classes.Graph as Graph
+
+MAX_EDGES = 1000000 # Larger graphs are skipped.
+EXACT_MAX_VERTICES = 1000 # The exact solver only runs up to this size...
+EXACT_TIME_LIMIT = 5 # ...for at most this many seconds.
+
+# --------------------------------- Families --------------------------------- #
+# Each family maps a vertex count to (vertices, expected edge count, edge
+# generator); the vertices may be rounded from the count asked.
+
+# Pairs (v, w), w < v, each present with probability p (Batagelj-Brandes:
+# jumps straight to the next present pair). O(n + edges).
+def gnp_pairs(n, p, rng):
+    if (p <= 0):
+        return
+    if (p >= 1):
+        yield from ((v, w) for v in range(n) for w in range(v))
+        return
+    _log = math.log(1 - p)
+    v = 1
+    w = -1
+    while v < n:
+        w += 1 + int(math.log(1 - rng.random()) / _log)
+        while w >= v and v < n:
+            w -= v
+            v += 1
+        if (v < n):
+            yield v, w
+
+# Random graph, every pair joined with probability p.
+def gnp(p):
+    return lambda n: (n, p * n * (n - 1) / 2, lambda rng: gnp_pairs(n, p, rng))
+
+# Random graph of average degree degree.
+def sparse(degree):
+    return lambda n: gnp(min(1, degree / max(n - 1, 1)))(n)
+
+# Indices in range(total), each present with probability p, jumping straight
+# to the next present one. O(present indices).
+def present(total, p, rng):
+    if (p >= 1):
+        yield from range(total)
+        return
+    if (p <= 0):
+        return
+    _log = math.log(1 - p)
+    k = -1
+    while True:
+        k += 1 + int(math.log(1 - rng.random()) / _log)
+        if k >= total:
+            return
+        yield k
+
+# Two halves, every pair across them joined with the probability giving
+# average degree degree. Two colors are always enough.
+def bipartite(degree):
+    def _family(n):
+        _a = n // 2
+        _b = n - _a
+        _p = min(1, degree * n / 2 / max(_a * _b, 1))
+        # Cell k of the _a x _b table of pairs across is (k // _b, _a + k % _b).
+        return n, _a * _b * _p, lambda rng: ((k // _b, _a + k % _b) for k in present(_a * _b, _p, rng))
+    return _family
+
+# Square grid (n rounded down to a square) with one diagonal per cell: planar,
+# three colors are enough.
+def grid(n):
+    _side = max(1, math.isqrt(n))
+    def _edges(rng):
+        for r in range(_side):
+            for c in range(_side):
+                v = r * _side + c
+                if (c + 1 < _side):
+                    yield v, v + 1
+                if (r + 1 < _side):
+                    yield v, v + _side
+                if (c + 1 < _side and r + 1 < _side):
+                    yield v, v + _side + 1
+    return _side * _side, 3 * _side * _side, _edges
+
+FAMILIES = {
+    "gnp(0.01)": gnp(0.01),
+    "sparse(6)": sparse(6),
+    "dense(0.5)": gnp(0.5),
+    "bipartite(10)": bipartite(10),
+    "grid": grid,
+}
+
+# Builds the non directional FrozenGraph of n vertices (ids as labels).
+def build(n, edges):
+    _graph = Graph.Graph(False, False)
+    _graph.vertices_add(str(i) for i in range(n))
+    _graph.edges_add((str(v), str(w), 1) for v, w in edges)
+    return _graph.freeze()
+
+# -------------------------------- Algorithms -------------------------------- #
+# Each takes a FrozenGraph and returns (colors, optimal): optimal is True/False
+# for the exact solver (proved or not), None for the heuristics.
+
+def exact(view):
+    return Coloring.chromatic(view, EXACT_TIME_LIMIT)
+
+ALGORITHMS = {
+    "dsatur": lambda view: (Coloring.dsatur(view), None),
+    "welsh_powell": lambda view: (Coloring.welsh_powell(view, "largest_first"), None),
+    "smallest_last": lambda view: (Coloring.welsh_powell(view, "smallest_last"), None),
+    "exact": exact,
+}
+if (Graph.np != None):
+    ALGORITHMS["jones_plassmann"] = lambda view: (Coloring.jones_plassmann(view), None)
+
+# Returns the result of one algorithm on one graph as a dict.
+def measure(name, algorithm, view):
+    _start = time.perf_counter()
+    _colors, _optimal = algorithm(view)
+    _elapsed = time.perf_counter() - _start
+
+    tracemalloc.start()
+    algorithm(view)
+    _, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    _valid = (len(_colors) == view.vertex_count() and (len(_colors) == 0 or min(_colors) >= 0)
+              and Coloring.coloring_valid(view, _colors))
+    return {
+        "algorithm": name,
+        "seconds": _elapsed,
+        "peak_bytes": _peak,
+        "colors": Coloring.colors_used(_colors),
+        "valid": _valid,
+        "optimal": _optimal,
+    }
+
+def main():
+    _sizes = [int(s) for s in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1000, 10000, 100000]
+    _output = sys.argv[2] if len(sys.argv) > 2 else None
+
+    _results = []
+    print(f"{'family':<14} {'vertices':>9} {'edges':>9} {'algorithm':<16} {'seconds':>9} {'peak MiB':>9} {'colors':>6}  notes")
+    for _family, _make in FAMILIES.items():
+        for _n in _sizes:
+            _vertices, _expected, _edges = _make(_n)
+            if (_expected > MAX_EDGES):
+                print(f"{_family:<14} {_vertices:>9} {'':>9} skipped, about {_expected:.0f} edges")
+                continue
+            _view = build(_vertices, _edges(random.Random(_n)))
+            _m = _view.edge_count() // 2
+            for _name, _algorithm in ALGORITHMS.items():
+                if (_name == "exact" and _view.vertex_count() > EXACT_MAX_VERTICES):
+                    continue
+                _result = measure(_name, _algorithm, _view)
+                _result.update({"family": _family, "vertices": _view.vertex_count(), "edges": _m})
+                _results.append(_result)
+                _notes = "" if _result["valid"] else "INVALID"
+                if (_result["optimal"] != None):
+                    _notes += " optimal" if _result["optimal"] else f" best in {EXACT_TIME_LIMIT}s"
+                print(f"{_family:<14} {_view.vertex_count():>9} {_m:>9} {_name:<16} {_result['seconds']:>9.3f} "
+                      f"{_result['peak_bytes'] / 2**20:>9.1f} {_result['colors']:>6} {_notes}")
+
+    if (_output != None):
+        with open(_output, "w", encoding="utf-8") as _file:
+            json.dump(_results, _file, indent=2)
+        print(f"Results written to {_output}")
+
+if __name__ == "__main__":
+    main()
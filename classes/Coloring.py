@@ -0,0 +1,454 @@
+import heapq
+import os
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import classes.Graph as Graph
+import classes.GraphFile as GraphFile
+import classes.Search as Search
+
+# ---------------------------------------------------------------------------- #
+#                                Graph Coloring                                #
+# ---------------------------------------------------------------------------- #
+#
+# Vertex coloring over an integer indexed representation (Graph.freeze() or
+# Graph.matrix). Edge direction is ignored: two vertices joined by an edge
+# either way must get different colors. Colorings are arrays of color per
+# vertex id, colors numbered from 0. Self-loops are ignored.
+
+# Returns, for every vertex id, the list of it's neighbors other than itself.
+def neighbor_lists(view):
+    _lists = []
+    for v in range(view.vertex_count()):
+        _lists.append([w for w in view.neighbors(v) if w != v])
+    return _lists
+
+# Returns True if no edge joins two vertices of the same color.
+def coloring_valid(view, colors):
+    for v in range(view.vertex_count()):
+        for w in view.neighbors(v):
+            if w != v and colors[w] == colors[v]:
+                return False
+    return True
+
+# Number of colors used by a coloring.
+def colors_used(colors):
+    return (max(colors) + 1) if len(colors) else 0
+
+# ---------------------------------- DSATUR ---------------------------------- #
+# Colors the uncolored vertex with the most distinct neighbor colors
+# (saturation) next, breaking ties by degree, with the smallest color none of
+# it's neighbors uses. Each vertex keeps the set of it's neighbors' colors.
+#
+# The next vertex comes from buckets: buckets[saturation][degree] is a stack of
+# vertices, and each saturation level keeps a small heap of the degrees it
+# holds. Saturation and degree are small integers, so this avoids a heap over
+# all vertices. A vertex is pushed again whenever it's saturation grows and
+# outdated entries are skipped when popped: O(V + E) bucket operations plus
+# heap operations over the distinct degrees only.
+def dsatur(view):
+    n = view.vertex_count()
+    colors = array("l", [-1]) * n
+    with Graph.gc_paused():
+        neighbors = neighbor_lists(view)
+        neighbor_colors = [set() for _ in range(n)]
+
+        buckets = [{}] # saturation -> {degree: [vertices]}
+        degrees = [[]] # saturation -> heap of -degree present in buckets[saturation]
+
+        def _push(v, saturation):
+            while len(buckets) <= saturation:
+                buckets.append({})
+                degrees.append([])
+            degree = len(neighbors[v])
+            stack = buckets[saturation].get(degree)
+            if (stack == None):
+                stack = buckets[saturation][degree] = []
+                heapq.heappush(degrees[saturation], -degree)
+            stack.append(v)
+
+        for v in range(n):
+            _push(v, 0)
+
+        top = 0 # Highest saturation that may hold vertices.
+        while top >= 0:
+            level = buckets[top]
+            if (not level):
+                top -= 1
+                continue
+            degree = -degrees[top][0]
+            stack = level[degree]
+            v = stack.pop()
+            if (not stack):
+                del level[degree]
+                heapq.heappop(degrees[top])
+            # Already colored, or pushed before it's saturation last grew.
+            if colors[v] != -1 or len(neighbor_colors[v]) != top:
+                continue
+
+            used = neighbor_colors[v]
+            color = 0
+            while color in used:
+                color += 1
+            colors[v] = color
+
+            for w in neighbors[v]:
+                if colors[w] == -1 and color not in neighbor_colors[w]:
+                    neighbor_colors[w].add(color)
+                    saturation = len(neighbor_colors[w])
+                    _push(w, saturation)
+                    if (saturation > top):
+                        top = saturation
+
+    return colors
+
+# ------------------------------- Welsh Powell ------------------------------- #
+# Vertex orderings, all O(V + E):
+#   "largest_first"  by degree, highest first (Welsh-Powell's own order).
+#   "smallest_last"  repeatedly removes the vertex of least remaining degree;
+#                    the reverse of that removal order (Matula-Beck). Never
+#                    needs more colors than the graph's degeneracy + 1.
+def vertex_order(neighbors, order = "largest_first"):
+    n = len(neighbors)
+    degree = [len(adjacent) for adjacent in neighbors]
+    buckets = [[] for _ in range(max(degree, default=0) + 1)]
+
+    if (order == "largest_first"):
+        # Counting sort by degree, one pass.
+        for v in range(n):
+            buckets[degree[v]].append(v)
+        return [v for bucket in reversed(buckets) for v in bucket]
+
+    if (order == "smallest_last"):
+        for v in range(n):
+            buckets[degree[v]].append(v)
+        removed = bytearray(n)
+        removal = []
+        low = 0 # Lowest bucket that may hold a vertex.
+        while len(removal) < n:
+            while not buckets[low]:
+                low += 1
+            v = buckets[low].pop()
+            # Outdated entry: already removed, or it's degree dropped since.
+            if removed[v] or degree[v] != low:
+                continue
+            removed[v] = 1
+            removal.append(v)
+            for w in neighbors[v]:
+                if not removed[w]:
+                    degree[w] -= 1
+                    buckets[degree[w]].append(w)
+                    if degree[w] < low:
+                        low = degree[w]
+        removal.reverse()
+        return removal
+
+    raise ValueError(f"Unknown vertex order {order!r}.")
+
+# Colors one class at a time: walks the ordered uncolored vertices giving the
+# current color to every one not next to a vertex that already got it. A
+# vertex colored in this class stamps it's neighbors in blocked (stamped with
+# the class number, so it never needs clearing) and the uncolored list shrinks
+# after each class.
+def welsh_powell(view, order = "largest_first"):
+    n = view.vertex_count()
+    colors = array("l", [-1]) * n
+    with Graph.gc_paused():
+        neighbors = neighbor_lists(view)
+        uncolored = vertex_order(neighbors, order)
+
+    blocked = array("l", [-1]) * n
+    color = 0
+    while uncolored:
+        left = []
+        for v in uncolored:
+            if blocked[v] == color:
+                left.append(v)
+                continue
+            colors[v] = color
+            for w in neighbors[v]:
+                blocked[w] = color
+        uncolored = left
+        color += 1
+
+    return colors
+
+# ---------------------------- Exact (Branch and Bound) ---------------------- #
+# A large clique, grown greedily from every vertex by adding the candidate of
+# highest degree. Any coloring needs at least it's size in colors.
+def clique_greedy(neighbors):
+    degree = [len(adjacent) for adjacent in neighbors]
+    best = []
+    for v in sorted(range(len(neighbors)), key=degree.__getitem__, reverse=True):
+        if degree[v] < len(best):
+            break # Can't be part of a larger clique.
+        clique = [v]
+        candidates = set(neighbors[v])
+        while candidates:
+            u = max(candidates, key=degree.__getitem__)
+            clique.append(u)
+            candidates.intersection_update(neighbors[u])
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+# Splits off the vertices that any k coloring of the rest can be extended to:
+# repeatedly removes vertices with less than k neighbors left, which always
+# have a color free once their remaining neighbors are colored. Returns
+# (core, removed): the k-core, and the removed vertices in removal order.
+def peel(neighbors, k):
+    n = len(neighbors)
+    degree = [len(adjacent) for adjacent in neighbors]
+    removed = [v for v in range(n) if degree[v] < k]
+    gone = bytearray(n)
+    for v in removed:
+        gone[v] = 1
+    i = 0
+    while i < len(removed):
+        for w in neighbors[removed[i]]:
+            degree[w] -= 1
+            if not gone[w] and degree[w] < k:
+                gone[w] = 1
+                removed.append(w)
+        i += 1
+    return [v for v in range(n) if not gone[v]], removed
+
+# Looks for a coloring with at most k colors by DSATUR backtracking over the
+# k-core, then colors the peeled vertices back in (see peel). The vertices of
+# clique found in the core are colored 0, 1, ... up front, and a vertex only
+# ever tries the colors in use plus one new color, so no coloring is searched
+# again under renamed colors. Branches on the uncolored vertex with the most
+# distinct neighbor colors, ties by degree. Iterative, so it isn't bound by the
+# recursion limit; each vertex keeps how many of it's neighbors have each
+# color, updated in O(degree) per step.
+# Returns (colors, timed out): colors is None if there's no such coloring, or
+# time ran out first.
+def color_at_most(neighbors, k, clique, deadline = None):
+    n = len(neighbors)
+    core, removed = peel(neighbors, k)
+    in_core = bytearray(n)
+    for v in core:
+        in_core[v] = 1
+    adjacent = [[w for w in neighbors[v] if in_core[w]] if in_core[v] else [] for v in range(n)]
+    degree = [len(a) for a in adjacent]
+    counts = array("l", [0]) * (n * k) # counts[v*k + c]: neighbors of v colored c.
+    saturation = array("l", [0]) * n
+    colors = array("l", [-1]) * n
+
+    def _color(v, c):
+        colors[v] = c
+        for w in adjacent[v]:
+            i = w * k + c
+            counts[i] += 1
+            if counts[i] == 1:
+                saturation[w] += 1
+
+    def _uncolor(v):
+        c = colors[v]
+        colors[v] = -1
+        for w in adjacent[v]:
+            i = w * k + c
+            counts[i] -= 1
+            if counts[i] == 0:
+                saturation[w] -= 1
+
+    # Next vertex to branch on, -1 once the core is colored.
+    def _select():
+        chosen = -1
+        key = (-1, -1)
+        for u in core:
+            if colors[u] == -1 and (saturation[u], degree[u]) > key:
+                chosen = u
+                key = (saturation[u], degree[u])
+        return chosen
+
+    # Colors v may take with used colors in use: the ones none of it's
+    # neighbors have, and a new one while there are less than k.
+    def _candidates(v, used):
+        base = v * k
+        options = [c for c in range(used) if counts[base + c] == 0]
+        if (used < k):
+            options.append(used)
+        return options
+
+    used = 0
+    for v in clique:
+        if in_core[v]:
+            _color(v, used)
+            used += 1
+
+    nodes = 0
+    v = _select()
+    stack = [] # Frames [vertex, candidate colors, next candidate, colors in use before it].
+    if (v != -1):
+        stack.append([v, _candidates(v, used), 0, used])
+    while stack:
+        frame = stack[-1]
+        v, options, i, used = frame
+        if colors[v] != -1:
+            _uncolor(v)
+        if i == len(options):
+            stack.pop()
+            continue
+        frame[2] = i + 1
+        _color(v, options[i])
+        used = max(used, options[i] + 1)
+
+        nodes += 1
+        if (deadline != None and nodes % 1024 == 0 and time.perf_counter() > deadline):
+            return None, True
+
+        w = _select()
+        if w == -1:
+            break
+        stack.append([w, _candidates(w, used), 0, used])
+    else:
+        if (core):
+            return None, False # Every branch failed.
+
+    # Color the peeled vertices, last removed first, with the first free color.
+    taken = array("l", [-1]) * (k + 1)
+    for v in reversed(removed):
+        for w in neighbors[v]:
+            if colors[w] != -1:
+                taken[colors[w]] = v
+        c = 0
+        while taken[c] == v:
+            c += 1
+        colors[v] = c
+    return colors, False
+
+# Finds a coloring with the fewest colors (the chromatic number): DSATUR gives
+# the first coloring and a clique the lower bound, then color_at_most looks for
+# one less color each time until there's none (proved optimal) or the bounds
+# meet. time_limit (seconds) bounds the search, returning the best coloring
+# found by then. Returns (colors, exact): exact is True if colors is proved
+# optimal.
+def chromatic(view, time_limit = None):
+    deadline = None if time_limit == None else time.perf_counter() + time_limit
+    best = dsatur(view)
+    with Graph.gc_paused():
+        neighbors = [list(set(adjacent)) for adjacent in neighbor_lists(view)]
+    clique = clique_greedy(neighbors)
+    while colors_used(best) > len(clique):
+        colors, timed_out = color_at_most(neighbors, colors_used(best) - 1, clique, deadline)
+        if (timed_out):
+            return best, False
+        if (colors == None):
+            break
+        best = colors
+    return best, True
+
+# ------------------------ Jones Plassmann (parallel) ------------------------ #
+# Every vertex gets a random priority. Each round colors, at once, every
+# uncolored vertex whose neighbors of higher priority are all colored, with the
+# smallest color none of it's colored neighbors has; no two of them are
+# neighbors, so they can be colored independently. A round only reads the
+# colors of earlier rounds, so the coloring depends on the seed alone, not on
+# how the vertices are split between workers.
+#
+# Every vertex counts it's neighbors of higher priority still uncolored, and
+# the vertices a round colors lower the counts of their neighbors: the ones
+# reaching 0 make the next round. So every edge is looked at a constant number
+# of times overall, not once per round.
+#
+# The rounds are spread over a pool of processes, chunk_size vertices to a task.
+# As in ShortestPath.distances_from, the graph is written once to a temporary
+# binary graph file every worker memory maps; the priorities and colors live in
+# a second mapped file the workers read and this process writes between rounds.
+
+worker_view = None # The mapped FrozenGraph, in each worker process.
+worker_state = None # The mapped (priorities, colors), in each worker process.
+
+def worker_init(path, state_path):
+    global worker_view, worker_state
+    worker_view = GraphFile.load_binary(path)
+    worker_state = Graph.np.memmap(state_path, dtype=Graph.np.int64, mode="r", shape=(2, worker_view.vertex_count()))
+
+# Counts the neighbors of higher priority of a chunk of vertices.
+def worker_count(vertices):
+    np = Graph.np
+    owner, adjacent = neighbor_gather(worker_view, vertices)
+    priority = worker_state[0]
+    higher = priority[adjacent] > priority[vertices[owner]]
+    return np.bincount(owner[higher], minlength=len(vertices))
+
+# Colors a chunk of ready vertices, see jones_plassmann_colors.
+def worker_color(vertices):
+    return jones_plassmann_colors(worker_view, worker_state[0], worker_state[1], vertices)
+
+# Search.adjacency_gather over a FrozenGraph's edges either way, without self-loops.
+def neighbor_gather(view, vertices):
+    np = Graph.np
+    owner, adjacent = Search.adjacency_gather(np.frombuffer(view.offsets, dtype=np.int64),
+                                              np.frombuffer(view.targets, dtype=np.int32), vertices)
+    if (view.directional):
+        _owner, _adjacent = Search.adjacency_gather(np.frombuffer(view.in_offsets, dtype=np.int64),
+                                                    np.frombuffer(view.in_targets, dtype=np.int32), vertices)
+        owner = np.concatenate((owner, _owner))
+        adjacent = np.concatenate((adjacent, _adjacent))
+    keep = adjacent != vertices[owner]
+    return owner[keep], adjacent[keep]
+
+# Colors ready vertices (a numpy array). Returns numpy arrays (their colors,
+# their neighbors of lower priority, once per edge).
+def jones_plassmann_colors(view, priority, colors, vertices):
+    np = Graph.np
+    owner, adjacent = neighbor_gather(view, vertices)
+    adjacent_colors = colors[adjacent]
+
+    # Smallest free color: with the neighbors' distinct colors sorted, the
+    # first one that differs from it's rank, or their count.
+    colored = adjacent_colors >= 0
+    span = int(adjacent_colors.max()) + 2 if adjacent_colors.size else 1
+    pairs = np.unique(owner[colored] * span + adjacent_colors[colored])
+    pair_owner = pairs // span
+    rank = np.arange(len(pairs)) - np.searchsorted(pair_owner, pair_owner)
+    free = np.bincount(pair_owner, minlength=len(vertices))
+    gap = (pairs % span) != rank
+    np.minimum.at(free, pair_owner[gap], rank[gap])
+
+    return free, adjacent[priority[adjacent] < priority[vertices[owner]]]
+
+# Colors a FrozenGraph with Jones-Plassmann over workers processes (defaults to
+# the number of CPUs). Needs numpy.
+def jones_plassmann(frozen, seed = 0, workers = None, chunk_size = 65536):
+    np = Graph.np
+    n = frozen.vertex_count()
+    if (n == 0):
+        return array("l")
+
+    _fd, _path = tempfile.mkstemp(suffix=".graph")
+    os.close(_fd)
+    _fd, _state_path = tempfile.mkstemp(suffix=".colors")
+    os.close(_fd)
+    _state = None
+    try:
+        GraphFile.save_binary(frozen, _path)
+        _state = np.memmap(_state_path, dtype=np.int64, mode="w+", shape=(2, n))
+        _state[0] = np.random.default_rng(seed).permutation(n)
+        _state[1] = -1
+        _state.flush()
+
+        def _chunks(vertices):
+            return [vertices[i:i+chunk_size] for i in range(0, vertices.size, chunk_size)]
+
+        with ProcessPoolExecutor(workers, initializer=worker_init, initargs=(_path, _state_path)) as _pool:
+            _waiting = np.concatenate(list(_pool.map(worker_count, _chunks(np.arange(n, dtype=np.int64)))))
+            _ready = np.flatnonzero(_waiting == 0)
+            while _ready.size:
+                _chunk_list = _chunks(_ready)
+                _lower = []
+                for _vertices, (_colors, _neighbors) in zip(_chunk_list, _pool.map(worker_color, _chunk_list)):
+                    _state[1, _vertices] = _colors
+                    _lower.append(_neighbors)
+                # One less neighbor of higher priority to wait for, per edge.
+                _touched, _times = np.unique(np.concatenate(_lower), return_counts=True)
+                _waiting[_touched] -= _times
+                _ready = _touched[_waiting[_touched] == 0]
+        return array("l", _state[1].tolist())
+    finally:
+        del _state # Unmap before removing the file.
+        os.remove(_path)
+        os.remove(_state_path)
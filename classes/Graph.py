@@ -1,20 +1,345 @@
+import gc
+import itertools
+from array import array
+from contextlib import contextmanager
+
+# numpy is only needed for the adjacency matrix representation.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Pauses the cyclic garbage collector. Bulk loads create millions of objects,
+# which would otherwise trigger a full collection over and over.
+@contextmanager
+def gc_paused():
+    _enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if _enabled:
+            gc.enable()
+
 # ---------------------------------------------------------------------------- #
 #                                    Vertex                                    #
 # ---------------------------------------------------------------------------- #
 class Vertex:
-    def __init__(self, label, edges):
+    # No per-instance __dict__: graphs hold a lot of these.
+    __slots__ = ("label", "edges", "in_edges", "position", "slot")
+
+    def __init__(self, label):
         self.label = label
-        self.edges = edges # Useless?
+        self.edges = {} # Outbound edges, keyed by destination Vertex.
+        self.in_edges = {} # Inbound edges, keyed by origin Vertex.
+        self.position = None # Optional coordinates, e.g. (x, y), for A* heuristics.
+        self.slot = -1 # Position in Graph.vertices.
 
 # ---------------------------------------------------------------------------- #
 #                                     Edge                                     #
 # ---------------------------------------------------------------------------- #
 
 class Edge:
+    # No per-instance __dict__: graphs hold a lot of these.
+    __slots__ = ("origin", "destination", "weight", "slot")
+
     def __init__(self, origin, destination, weight):
         self.origin = origin
         self.destination = destination
         self.weight = weight
+        self.slot = -1 # Position in Graph.edges.
+
+# ---------------------------------------------------------------------------- #
+#                                 Frozen Graph                                 #
+# ---------------------------------------------------------------------------- #
+
+# Immutable, integer indexed snapshot of a Graph in CSR (compressed sparse row)
+# form. Vertex i's adjacent ids are targets[offsets[i]:offsets[i+1]], with the
+# matching weights at the same positions. For directional graphs the in_*
+# arrays hold the reversed edges; otherwise they are the same arrays as out.
+class FrozenGraph:
+    def __init__(self, labels, weighted, directional, offsets, targets, weights, in_offsets, in_targets, in_weights):
+        self.labels = labels # id -> label
+        self.ids_cache = None # label -> id, built on first use.
+        self.weighted = weighted
+        self.directional = directional
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.in_offsets = in_offsets
+        self.in_targets = in_targets
+        self.in_weights = in_weights
+        self.positions = None # id -> Vertex.position, if any vertex had one.
+        self.forward = None # Non directional only: entry k is 1 if the edge is stored from it's row to targets[k].
+
+    # Number of vertices in the snapshot.
+    def vertex_count(self):
+        return len(self.labels)
+
+    # label -> id mapping. Built lazily, so opening a large saved graph doesn't pay for it.
+    @property
+    def ids(self):
+        if (self.ids_cache == None):
+            self.ids_cache = {label: i for i, label in enumerate(self.labels)}
+        return self.ids_cache
+
+    # Returns the id of a vertex given it's label, None if not found.
+    def id_get(self, label):
+        return self.ids.get(label)
+
+    # Number of entries in the adjacency arrays.
+    def edge_count(self):
+        return len(self.targets)
+
+    # Returns the ids adjacent to vertex i, with respect to edge direction.
+    def adjacent(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i+1]]
+
+    # Returns the ids with an edge into vertex i.
+    def adjacent_in(self, i):
+        return self.in_targets[self.in_offsets[i]:self.in_offsets[i+1]]
+
+    # Returns the ids connected to vertex i, regardless of edge direction.
+    def neighbors(self, i):
+        if (not self.directional):
+            return self.adjacent(i)
+        return list(dict.fromkeys(itertools.chain(self.adjacent(i), self.adjacent_in(i))))
+
+    # Builds an editable Graph with the same vertices, edges and positions. Non
+    # directional snapshots hold both directions of every edge, only the stored
+    # one (see forward) is created; without forward, the one from the lower id.
+    # A pair that was stored both ways comes back both ways, with the lighter weight.
+    def thaw(self):
+        _graph = Graph(self.weighted, self.directional)
+        _labels = self.labels
+        _targets = self.targets
+        _forward = self.forward
+        _graph.vertices_add(_labels[i] for i in range(len(_labels)))
+
+        def _stored(i, k):
+            if (self.directional):
+                return True
+            if (_forward != None):
+                return _forward[k] == 1
+            return i <= _targets[k]
+
+        # Weights are stored as floats, give whole ones back as integers.
+        _graph.edges_add((_labels[i], _labels[_targets[k]], int(w) if w.is_integer() else w)
+                         for i in range(len(_labels))
+                         for k in range(self.offsets[i], self.offsets[i+1]) if _stored(i, k)
+                         for w in (self.weights[k],))
+        if (self.positions != None):
+            for i, _position in enumerate(self.positions):
+                _graph.vertices[i].position = _position
+        return _graph
+
+# ---------------------------------------------------------------------------- #
+#                               Adjacency Matrix                               #
+# ---------------------------------------------------------------------------- #
+
+# Dense adjacency matrix kept in sync with a Graph (see Graph.matrix_enable).
+# present[i, j] tells if the edge i -> j exists and weights[i, j] holds it's
+# weight, mirroring the edges stored in the Graph. Rows are indexed like a
+# FrozenGraph (labels / ids), so the same algorithms can read either one.
+class AdjacencyMatrix:
+    def __init__(self, weighted, directional, capacity = 16):
+        if (np == None):
+            raise ImportError("The adjacency matrix representation requires numpy.")
+        self.weighted = weighted
+        self.directional = directional
+        self.labels = [] # row -> label
+        self.ids = {} # label -> row
+        # Allocated with spare room, only the first vertex_count() rows/columns are used.
+        self.present = np.zeros((capacity, capacity), dtype=bool)
+        self.weights = np.zeros((capacity, capacity), dtype=np.float64)
+
+    # Number of vertices (used rows) in the matrix.
+    def vertex_count(self):
+        return len(self.labels)
+
+    # Returns the row of a vertex given it's label, None if not found.
+    def id_get(self, label):
+        return self.ids.get(label)
+
+    # Doubles the allocated size, copying the used part over.
+    def _grow(self, capacity = 0):
+        _n = len(self.labels)
+        _capacity = max(16, self.present.shape[0] * 2, capacity)
+        _present = np.zeros((_capacity, _capacity), dtype=bool)
+        _weights = np.zeros((_capacity, _capacity), dtype=np.float64)
+        _present[:_n, :_n] = self.present[:_n, :_n]
+        _weights[:_n, :_n] = self.weights[:_n, :_n]
+        self.present = _present
+        self.weights = _weights
+
+    def vertex_add(self, label):
+        if (len(self.labels) == self.present.shape[0]):
+            self._grow()
+        self.ids[label] = len(self.labels)
+        self.labels.append(label)
+
+    # Adds many vertices, growing the allocation at most once.
+    def vertices_add(self, labels):
+        _needed = len(self.labels) + len(labels)
+        if (_needed > self.present.shape[0]):
+            self._grow(_needed)
+        for label in labels:
+            self.ids[label] = len(self.labels)
+            self.labels.append(label)
+
+    # Removes a vertex and all it's edges by moving the last row/column into it's place.
+    def vertex_remove(self, label):
+        _row = self.ids.pop(label)
+        _last = len(self.labels) - 1
+        _moved = self.labels.pop()
+        if (_row != _last):
+            for _m in (self.present, self.weights):
+                _m[_row, :_last+1] = _m[_last, :_last+1]
+                _m[:_last+1, _row] = _m[:_last+1, _last]
+            self.labels[_row] = _moved
+            self.ids[_moved] = _row
+        for _m in (self.present, self.weights):
+            _m[_last, :_last+1] = 0
+            _m[:_last+1, _last] = 0
+
+    def vertex_label(self, label, new_label):
+        _row = self.ids.pop(label)
+        self.ids[new_label] = _row
+        self.labels[_row] = new_label
+
+    def edge_set(self, origin, destination, weight):
+        _o = self.ids[origin]
+        _d = self.ids[destination]
+        self.present[_o, _d] = True
+        self.weights[_o, _d] = weight
+
+    def edge_clear(self, origin, destination):
+        _o = self.ids[origin]
+        _d = self.ids[destination]
+        self.present[_o, _d] = False
+        self.weights[_o, _d] = 0
+
+    # Sets many edges at once, given parallel sequences of origin rows, destination rows and weights.
+    def edges_set(self, origins, destinations, weights):
+        self.present[origins, destinations] = True
+        self.weights[origins, destinations] = weights
+
+    # Boolean row of the vertices adjacent to row i, with respect to edge direction.
+    def adjacent_mask(self, i):
+        _n = len(self.labels)
+        if (self.directional):
+            return self.present[i, :_n]
+        return self.present[i, :_n] | self.present[:_n, i]
+
+    # Returns the rows adjacent to row i, with respect to edge direction.
+    def adjacent(self, i):
+        return np.flatnonzero(self.adjacent_mask(i))
+
+    # Returns the rows with an edge into row i.
+    def adjacent_in(self, i):
+        _n = len(self.labels)
+        if (self.directional):
+            return np.flatnonzero(self.present[:_n, i])
+        return self.adjacent(i)
+
+    # Returns the rows connected to row i, regardless of edge direction.
+    def neighbors(self, i):
+        _n = len(self.labels)
+        return np.flatnonzero(self.present[i, :_n] | self.present[:_n, i])
+
+# ---------------------------------------------------------------------------- #
+#                              Maintained Coloring                             #
+# ---------------------------------------------------------------------------- #
+
+# A proper vertex coloring of a Graph, kept up to date by it's edits (see
+# Graph.coloring_enable) instead of coloring again from scratch. Edge direction
+# is ignored and self-loops never conflict. Every edit costs O(degree):
+#   - an edge between two vertices of the same color recolors the endpoint
+#     with fewer neighbors to the smallest color none of them have.
+#   - removing an edge moves each endpoint down to it's smallest free color,
+#     if that's lower than it's own.
+#   - a new vertex takes color 0, a removed one just gives it's color up.
+# A color nobody has anymore leaves a gap. With compact, the vertices of the
+# highest color move into it (none can conflict, nobody has that color), so
+# the colors stay 0..count()-1 at the cost of that one color class.
+class VertexColoring:
+    def __init__(self, compact = True):
+        self.colors = {} # Vertex -> color.
+        self.classes = [] # color -> set of the vertices with it.
+        self.compact = compact
+
+    # Returns a vertex's color, None if it isn't colored.
+    def color_get(self, vertex):
+        return self.colors.get(vertex)
+
+    # Number of colors in use.
+    def count(self):
+        if (self.compact):
+            return len(self.classes)
+        return sum(1 for c in self.classes if c)
+
+    # Returns a dict label -> color.
+    def label_colors(self):
+        return {v.label: c for v, c in self.colors.items()}
+
+    # Smallest color none of the vertex's colored neighbors have.
+    def color_free(self, vertex):
+        _used = set()
+        for w in itertools.chain(vertex.edges, vertex.in_edges):
+            if w is not vertex:
+                _used.add(self.colors.get(w))
+        _color = 0
+        while _color in _used:
+            _color += 1
+        return _color
+
+    # Gives a vertex a color, moving it out of it's old color class.
+    def color_set(self, vertex, color):
+        _old = self.colors.get(vertex)
+        if (_old == color):
+            return
+        while len(self.classes) <= color:
+            self.classes.append(set())
+        self.classes[color].add(vertex)
+        self.colors[vertex] = color
+        if (_old != None):
+            self.classes[_old].discard(vertex)
+            self.emptied(_old)
+
+    # Deals with a color class that may have just lost it's last vertex.
+    def emptied(self, color):
+        if (self.classes[color]):
+            return
+        _last = len(self.classes) - 1
+        if (self.compact and color < _last):
+            for v in self.classes[_last]:
+                self.colors[v] = color
+            self.classes[color], self.classes[_last] = self.classes[_last], self.classes[color]
+        # Trailing empty classes are dropped either way.
+        while self.classes and not self.classes[-1]:
+            self.classes.pop()
+
+    def vertex_add(self, vertex):
+        self.color_set(vertex, self.color_free(vertex))
+
+    def vertex_remove(self, vertex):
+        _color = self.colors.pop(vertex, None)
+        if (_color != None):
+            self.classes[_color].discard(vertex)
+            self.emptied(_color)
+
+    def edge_add(self, origin, destination):
+        if (origin is destination or self.colors[origin] != self.colors[destination]):
+            return
+        _degree = lambda v: len(v.edges) + len(v.in_edges)
+        _vertex = origin if _degree(origin) <= _degree(destination) else destination
+        self.color_set(_vertex, self.color_free(_vertex))
+
+    def edge_remove(self, origin, destination):
+        for v in (origin, destination):
+            _color = self.color_free(v)
+            if (_color < self.colors[v]):
+                self.color_set(v, _color)
 
 # ---------------------------------------------------------------------------- #
 #                                  Graph Class                                 #
@@ -24,35 +349,83 @@ class Graph:
     # Constructor
     def __init__(self, weighted, directional):
         self.vertices = []
-        self.edges = []
+        self.edges = [] # Removed edges leave a None behind until compact() runs.
+        self.edges_dead = 0 # How many None entries self.edges holds.
+        self.vertex_index = {} # label -> Vertex, kept in sync with self.vertices.
+        self.matrix = None # AdjacencyMatrix, only kept once matrix_enable() is called.
+        self.coloring = None # VertexColoring, only kept once coloring_enable() is called.
+        self.version = 0 # Bumped by every edit, so cached results can tell they're stale.
         self.weighted = weighted
         self.directional = directional
 
     # Returns a vertex by it's label, None if not found.
     def vertex_get(self, label):
-        for v in self.vertices:
-            if v.label == label:
-                return v
-        return None
+        return self.vertex_index.get(label)
     
     # Returns true if a vertex exists.
     def vertex_exists(self, label : str):
-        return (self.vertex_get(label) != None)
+        return (label in self.vertex_index)
 
     # Adds a empty vertex, not connected to anything yet.
     def vertex_add(self, label):
         if (self.vertex_exists(label)):
             return False
-        self.vertices.append(Vertex(label, []))
+        _vertex = Vertex(label)
+        _vertex.slot = len(self.vertices)
+        self.vertices.append(_vertex)
+        self.vertex_index[label] = _vertex
+        if (self.matrix != None):
+            self.matrix.vertex_add(label)
+        if (self.coloring != None):
+            self.coloring.vertex_add(_vertex)
+        self.version += 1
         return True
     
-    # Removes a vertex by a given label. Returns true if removed, or false if it doesn't exist.
+    # Adds many vertices from an iterable of labels. Labels that already exist, or
+    # repeat, are skipped. Returns the number of vertices added.
+    def vertices_add(self, labels):
+        _index = self.vertex_index
+        _new = []
+        with gc_paused():
+            for label in labels:
+                if (label in _index):
+                    continue
+                _vertex = Vertex(label)
+                _index[label] = _vertex
+                _new.append(_vertex)
+
+        for i, v in enumerate(_new, len(self.vertices)):
+            v.slot = i
+        self.vertices.extend(_new)
+        if (self.matrix != None):
+            self.matrix.vertices_add([v.label for v in _new])
+        if (self.coloring != None):
+            for v in _new:
+                self.coloring.vertex_add(v)
+        if (_new):
+            self.version += 1
+        return len(_new)
+
+    # Removes a vertex by a given label, along with all of it's edges. Returns true if removed, or false if it doesn't exist.
+    # O(degree): the last vertex of self.vertices takes the removed one's slot.
     def vertex_remove(self, label : str):
         _vertex = self.vertex_get(label)
         if (_vertex == None):
             return False
         
-        self.vertices.remove(_vertex)
+        # Only the vertex's own edges are visited, a self-loop shows up on both sides.
+        for _edge in dict.fromkeys(itertools.chain(_vertex.edges.values(), _vertex.in_edges.values())):
+            self.edge_detach(_edge)
+        _last = self.vertices.pop()
+        if (_last != _vertex):
+            _last.slot = _vertex.slot
+            self.vertices[_last.slot] = _last
+        del self.vertex_index[label]
+        if (self.matrix != None):
+            self.matrix.vertex_remove(label)
+        if (self.coloring != None):
+            self.coloring.vertex_remove(_vertex)
+        self.version += 1
         return True
 
     # Renames a vertex, by it's label. Returns true if renaming was made.
@@ -66,10 +439,31 @@ class Graph:
         if (_target != None):
             return False
         
-        # Rename the label safely.
+        # Rename the label safely, moving its index entry along with it.
+        del self.vertex_index[label]
         _vertex.label = new_label
+        self.vertex_index[new_label] = _vertex
+        if (self.matrix != None):
+            self.matrix.vertex_label(label, new_label)
+        self.version += 1
         return True
 
+    # Sets a vertex's coordinates (any tuple of numbers, or None). Returns true if the vertex exists.
+    def vertex_position(self, label : str, position):
+        _vertex = self.vertex_get(label)
+        if (_vertex == None):
+            return False
+        _vertex.position = position
+        self.version += 1
+        return True
+
+    # Sorts self.vertices in place by key, keeping every vertex's slot in step.
+    def vertices_sort(self, key):
+        self.vertices.sort(key=key)
+        for i, v in enumerate(self.vertices):
+            v.slot = i
+        self.version += 1
+
     # Gets an edge given origin and destination. Returns None if not found.
     def edge_get(self, origin : str, destination : str):
         _origin = self.vertex_get(origin)
@@ -78,11 +472,7 @@ class Graph:
         if (_origin == None or _dest == None):
             return None
         
-        for e in self.edges:
-            if (e.origin == _origin and e.destination == _dest):
-                return e
-
-        return None
+        return _origin.edges.get(_dest)
 
     # Returns True if a edge exists given the parameters, False otherwise.
     def edge_exists(self, origin : str, destination : str):
@@ -95,20 +485,100 @@ class Graph:
         
         if (_origin == None or _dest == None):
             return False
+        # Only one edge per (origin, destination) pair.
+        if (_dest in _origin.edges):
+            return False
 
-        self.edges.append(Edge(_origin, _dest, weight))
+        _edge = Edge(_origin, _dest, weight)
+        _edge.slot = len(self.edges)
+        self.edges.append(_edge)
+        _origin.edges[_dest] = _edge
+        _dest.in_edges[_origin] = _edge
+        if (self.matrix != None):
+            self.matrix.edge_set(origin, destination, weight)
+        if (self.coloring != None):
+            self.coloring.edge_add(_origin, _dest)
+        self.version += 1
         return True
     
+    # Adds many edges from an iterable of (origin, destination, weight) tuples.
+    # Every endpoint is checked first: if any doesn't exist, nothing is added and
+    # None is returned. Edges that already exist, or repeat, are skipped.
+    # Returns the number of edges added.
+    def edges_add(self, edges):
+        _index = self.vertex_index
+        _new = []
+        _added = []
+        with gc_paused():
+            for origin, destination, weight in edges:
+                _origin = _index.get(origin)
+                _dest = _index.get(destination)
+                if (_origin == None or _dest == None):
+                    return None
+                _new.append(Edge(_origin, _dest, weight))
+
+            # Everything is valid, link the edges in.
+            _slot = len(self.edges)
+            for _edge in _new:
+                _out = _edge.origin.edges
+                if (_edge.destination in _out):
+                    continue
+                _out[_edge.destination] = _edge
+                _edge.destination.in_edges[_edge.origin] = _edge
+                _edge.slot = _slot
+                _slot += 1
+                _added.append(_edge)
+            self.edges.extend(_added)
+
+        if (self.matrix != None and _added):
+            _ids = self.matrix.ids
+            self.matrix.edges_set([_ids[e.origin.label] for e in _added],
+                                  [_ids[e.destination.label] for e in _added],
+                                  [e.weight for e in _added])
+        if (self.coloring != None):
+            for e in _added:
+                self.coloring.edge_add(e.origin, e.destination)
+        if (_added):
+            self.version += 1
+        return len(_added)
+
     # Removes an edge given a origin and destionation. Returns true if succeeded.
     def edge_remove(self, origin : str, destination : str):
         _edge = self.edge_get(origin, destination)
         if (_edge == None):
             return False
 
-        # Remove from list.
-        self.edges.remove(_edge)
+        self.edge_detach(_edge)
+        if (self.matrix != None):
+            self.matrix.edge_clear(origin, destination)
+        if (self.coloring != None):
+            self.coloring.edge_remove(_edge.origin, _edge.destination)
+        self.version += 1
         return True
 
+    # Unlinks an edge from both endpoints' adjacency and leaves a None in it's
+    # slot of self.edges. Compacts the list once half of it is dead.
+    def edge_detach(self, edge):
+        del edge.origin.edges[edge.destination]
+        del edge.destination.in_edges[edge.origin]
+        self.edges[edge.slot] = None
+        self.edges_dead += 1
+        if (self.edges_dead * 2 > len(self.edges)):
+            self.compact()
+
+    # Drops the None entries left in self.edges by removals, renumbering the slots.
+    def compact(self):
+        if (self.edges_dead == 0):
+            return
+        self.edges = [e for e in self.edges if e != None]
+        for i, e in enumerate(self.edges):
+            e.slot = i
+        self.edges_dead = 0
+
+    # Returns the number of edges in the graph.
+    def edge_count(self):
+        return len(self.edges) - self.edges_dead
+
     # Returns the weight of a given edge
     def edge_get_weight(self, origin : str, destination : str):
         _edge = self.edge_get(origin, destination)
@@ -116,22 +586,14 @@ class Graph:
             return 0 # ? Return something else?
         return _edge.weight
 
-    # Returns the neighbors of the given vertex.
+    # Returns the neighbors of the given vertex, regardless of edge direction.
     def vertex_get_neighbors(self, label : str):
         _vertex = self.vertex_get(label)
         if (_vertex == None):
             return None
 
-        _neighbors = []
-        for e in self.edges:
-            if (e.origin == _vertex):
-                if not (e.destination in _neighbors):
-                    _neighbors.append(e.destination)
-            if (e.destination == _vertex):
-                if not (e.origin in _neighbors):
-                    _neighbors.append(e.origin)
-        
-        return _neighbors
+        # dict.fromkeys keeps the order while dropping duplicates (e.g. A->B and B->A).
+        return list(dict.fromkeys(itertools.chain(_vertex.edges, _vertex.in_edges)))
 
     # Returns the adjacent vertices of the given vertex with respect to edge direction.
     def vertex_get_adjacent(self, label : str):
@@ -139,16 +601,9 @@ class Graph:
         if (_vertex == None):
             return None
 
-        _neighbors = []
-        for e in self.edges:
-            if (e.origin == _vertex):
-                if not (e.destination in _neighbors):
-                    _neighbors.append(e.destination)
-            if (not self.directional) and (e.destination == _vertex):
-                if not (e.origin in _neighbors):
-                    _neighbors.append(e.origin)
-        
-        return _neighbors
+        if (self.directional):
+            return list(_vertex.edges)
+        return list(dict.fromkeys(itertools.chain(_vertex.edges, _vertex.in_edges)))
 
     # Returns a list of all the vertex's edges.
     def vertex_get_edges(self, label : str):
@@ -156,16 +611,10 @@ class Graph:
         if (_vertex == None):
             return None
 
-        _edges = []
-        for e in self.edges:
-            if (e.origin == _vertex):
-                if not (e in _edges):
-                    _edges.append(e)
-            if (not self.directional) and (e.destination == _vertex):
-                if not (e in _edges):
-                    _edges.append(e)
-        
-        return _edges
+        if (self.directional):
+            return list(_vertex.edges.values())
+        # A self-loop is both outbound and inbound, so drop duplicates.
+        return list(dict.fromkeys(itertools.chain(_vertex.edges.values(), _vertex.in_edges.values())))
 
     # Returns a string listing all vertices that exist.
     def get_string_vertices(self):
@@ -182,11 +631,88 @@ class Graph:
     # Returns a string listing all edges that exist.
     def get_string_edges(self):
         _s = "Edges: ["
-        for i in range(0, len(self.edges)):
-            _last = (i == len(self.edges)-1)
-            _e = self.edges[i]
-            _s += f"({_e.origin.label}, {_e.destination.label})"
-            if not _last:
-                _s += ", "
+        _s += ", ".join(f"({_e.origin.label}, {_e.destination.label})" for _e in self.edges if _e != None)
         _s += "]."
-        return _s
\ No newline at end of file
+        return _s
+
+    # Builds a read-only CSR snapshot (see FrozenGraph). Vertex ids follow the
+    # current order of self.vertices. The snapshot does not follow later edits.
+    def freeze(self):
+        _ids = {v: i for i, v in enumerate(self.vertices)}
+
+        def _build(adjacency):
+            _offsets = array("q", [0])
+            _targets = array("i")
+            _weights = array("d")
+            for v in self.vertices:
+                for _other, _edge in adjacency(v):
+                    _targets.append(_ids[_other])
+                    _weights.append(_edge.weight)
+                _offsets.append(len(_targets))
+            return _offsets, _targets, _weights
+
+        if (self.directional):
+            _out = _build(lambda v: v.edges.items())
+            _in = _build(lambda v: v.in_edges.items())
+        else:
+            # Both directions are adjacent. A pair stored both ways (A -> B and
+            # B -> A) acts as parallel edges: keep the lighter, so the arrays stay symmetric.
+            def _undirected(v):
+                for _other, _edge in v.edges.items():
+                    _back = v.in_edges.get(_other)
+                    yield _other, (_back if _back != None and _back.weight < _edge.weight else _edge)
+                for _other, _edge in v.in_edges.items():
+                    if _other not in v.edges:
+                        yield _other, _edge
+            _out = _build(_undirected)
+            _in = _out
+            # _undirected yields a row's stored edges first, the rest come in.
+            _forward = bytearray()
+            for i, v in enumerate(self.vertices):
+                _forward += b"\x01" * len(v.edges) + bytes(_out[0][i+1] - _out[0][i] - len(v.edges))
+
+        _labels = [v.label for v in self.vertices]
+        _frozen = FrozenGraph(_labels, self.weighted, self.directional, *_out, *_in)
+        if (not self.directional):
+            _frozen.forward = _forward
+        if (any(v.position != None for v in self.vertices)):
+            _frozen.positions = [v.position for v in self.vertices]
+        return _frozen
+
+    # Starts keeping an adjacency matrix (self.matrix) alongside the lists, built
+    # from the current vertices and edges and updated by every edit from now on.
+    # Requires numpy. Returns the matrix.
+    def matrix_enable(self):
+        if (self.matrix != None):
+            return self.matrix
+        _matrix = AdjacencyMatrix(self.weighted, self.directional, max(16, len(self.vertices)))
+        for v in self.vertices:
+            _matrix.vertex_add(v.label)
+        for v in self.vertices:
+            for _edge in v.edges.values():
+                _matrix.edge_set(v.label, _edge.destination.label, _edge.weight)
+        self.matrix = _matrix
+        self.version += 1 # Results indexed by the old representation no longer apply.
+        return _matrix
+
+    # Stops keeping the adjacency matrix.
+    def matrix_disable(self):
+        if (self.matrix != None):
+            self.matrix = None
+            self.version += 1
+
+    # Starts keeping a coloring (self.coloring) updated by every edit from now
+    # on, see VertexColoring. It starts as a greedy coloring, vertices of higher
+    # degree first. Returns the coloring.
+    def coloring_enable(self, compact = True):
+        if (self.coloring != None):
+            return self.coloring
+        _coloring = VertexColoring(compact)
+        for v in sorted(self.vertices, key=lambda v: len(v.edges) + len(v.in_edges), reverse=True):
+            _coloring.vertex_add(v)
+        self.coloring = _coloring
+        return _coloring
+
+    # Stops keeping the coloring.
+    def coloring_disable(self):
+        self.coloring = None
@@ -0,0 +1,211 @@
+import math
+import time
+import classes.Graph as Graph
+
+# ---------------------------------------------------------------------------- #
+#                               Hamiltonian Paths                              #
+# ---------------------------------------------------------------------------- #
+#
+# Shortest path from source to target going through every vertex exactly once,
+# over a FrozenGraph (Graph.freeze()), following edge direction. With source
+# equal to target it's the shortest cycle through every vertex instead. On non
+# weighted graphs every edge counts as 1. Paths are lists of vertex ids.
+
+HELD_KARP_MAX_BYTES = 256 * 1024 * 1024
+
+# Returns, for every vertex id, a dict of the cost to each adjacent vertex (the
+# lightest edge if there's more than one), leaving self-loops out.
+def edge_costs(view):
+    offsets = view.offsets
+    targets = view.targets
+    weights = view.weights if view.weighted else None
+    costs = []
+    for v in range(view.vertex_count()):
+        _costs = {}
+        for k in range(offsets[v], offsets[v+1]):
+            w = targets[k]
+            if w == v:
+                continue
+            c = weights[k] if weights != None else 1
+            if c < _costs.get(w, math.inf):
+                _costs[w] = c
+        costs.append(_costs)
+    return costs
+
+# Peak bytes held_karp takes for n vertices, with m = n - 1 (source left out):
+#   tables    a float64 cost and an int8 previous vertex for every (subset,
+#             last vertex) pair
+#   ordering  the 2^m subsets grouped by size: int64 subsets and order, int8 sizes
+#   layer     the widest layer's gather for one last vertex: the subsets, the
+#             costs before them and the candidates, (subsets, m) float64 each
+def held_karp_bytes(n):
+    m = max(n - 1, 0)
+    full = 1 << m
+    widest = math.comb(m, m // 2)
+    return full * m * 9 + full * 18 + widest * (m * 16 + 48)
+
+# Modes:
+#   "exact"      held_karp, the shortest such path.
+#   "heuristic"  nearest_neighbor, improved by two_opt. Fast but not always
+#                the shortest, and may miss a path that exists.
+#   "auto"       exact when it fits in max_bytes (see held_karp_bytes),
+#                heuristic otherwise.
+# time_limit (seconds) only bounds the heuristic's improvement.
+# Returns (distance, path, exact): (math.inf, [], exact) if no path was found,
+# exact is True if the answer is proved (shortest, or no path exists).
+def hamiltonian_path(view, source, target, mode = "auto", max_bytes = HELD_KARP_MAX_BYTES, time_limit = None):
+    if (mode == "auto"):
+        mode = "exact" if held_karp_bytes(view.vertex_count()) <= max_bytes else "heuristic"
+    if (mode == "exact"):
+        return held_karp(view, source, target, max_bytes) + (True,)
+    if (mode == "heuristic"):
+        costs = edge_costs(view)
+        path = two_opt(costs, nearest_neighbor(costs, source, target), time_limit)
+        distance = path_cost(costs, path)
+        return distance, (path if distance < math.inf else []), False
+    raise ValueError(f"Unknown Hamiltonian path mode {mode!r}.")
+
+# Total cost of a path, math.inf if some step has no edge.
+def path_cost(costs, path):
+    return sum(costs[path[i]].get(path[i+1], math.inf) for i in range(len(path) - 1))
+
+# ------------------------------- Held Karp --------------------------------- #
+# Dynamic programming over subsets, O(2^n * n^2) time and O(2^n * n) memory.
+# best[S, v] is the cost of the shortest path from source through exactly the
+# vertices in S (source left out), ending at v; it extends the best path
+# through S - {v} by one edge into v. Subsets are filled in order of size, and
+# for every last vertex v all the subsets holding it are computed at once with
+# numpy. prev[S, v] keeps the vertex before v to rebuild the path.
+# Raises ValueError if it would need more than max_bytes.
+def held_karp(view, source, target, max_bytes = HELD_KARP_MAX_BYTES):
+    np = Graph.np
+    n = view.vertex_count()
+    if (held_karp_bytes(n) > max_bytes):
+        raise ValueError(f"Held-Karp needs {held_karp_bytes(n) >> 20} MiB for {n} vertices, over the {max_bytes >> 20} MiB allowed.")
+    if (n == 1):
+        return 0.0, [source]
+
+    cycle = (source == target)
+    costs = edge_costs(view)
+    others = [v for v in range(n) if v != source]
+    m = len(others)
+    # cost[i, j] between others[i] and others[j], inf without an edge.
+    cost = np.full((m, m), np.inf)
+    for i, v in enumerate(others):
+        for j, w in enumerate(others):
+            if w in costs[v]:
+                cost[i, j] = costs[v][w]
+    start = np.array([costs[source].get(v, np.inf) for v in others])
+    back = np.array([costs[v].get(source, np.inf) for v in others])
+
+    full = (1 << m) - 1
+    best = np.full((full + 1, m), np.inf)
+    prev = np.full((full + 1, m), -1, dtype=np.int8)
+    best[1 << np.arange(m), np.arange(m)] = start
+
+    # Every subset, grouped by size.
+    subsets = np.arange(full + 1, dtype=np.int64)
+    sizes = np.zeros(full + 1, dtype=np.int8)
+    for b in range(m):
+        sizes += ((subsets >> b) & 1).astype(np.int8)
+    order = np.argsort(sizes, kind="stable")
+    bounds = np.searchsorted(sizes[order], np.arange(m + 2))
+    del subsets, sizes
+
+    last = -1 if cycle else others.index(target)
+    for size in range(2, m + 1):
+        layer = order[bounds[size]:bounds[size+1]]
+        for v in range(m):
+            # A path only ends at target once it has been everywhere.
+            if (v == last and size < m):
+                continue
+            holding = layer[(layer >> v) & 1 == 1]
+            candidates = best[holding ^ (1 << v)] + cost[:, v]
+            before = candidates.argmin(axis=1)
+            best[holding, v] = candidates[np.arange(len(holding)), before]
+            prev[holding, v] = before
+
+    if (cycle):
+        totals = best[full] + back
+        end = int(totals.argmin())
+        distance = float(totals[end])
+    else:
+        end = last
+        distance = float(best[full, end])
+    if (distance == math.inf):
+        return math.inf, []
+
+    path = [target] if cycle else []
+    subset = full
+    v = end
+    while v != -1:
+        path.append(others[v])
+        v, subset = int(prev[subset, v]), subset ^ (1 << v)
+    path.append(source)
+    path.reverse()
+    return distance, path
+
+# ------------------------------- Heuristic --------------------------------- #
+# Greedy path: from source, always on to the cheapest unvisited vertex, target
+# (unless it's also source) kept for last. With no unvisited vertex adjacent it
+# jumps to any, leaving a missing edge for two_opt to repair. O(V + E).
+def nearest_neighbor(costs, source, target):
+    n = len(costs)
+    visited = bytearray(n)
+    visited[source] = 1
+    visited[target] = 1
+    path = [source]
+    spare = 0 # Every vertex before it is visited.
+    for _ in range(n - (1 if source == target else 2)):
+        v = path[-1]
+        w = min((u for u in costs[v] if not visited[u]), key=costs[v].__getitem__, default=-1)
+        if (w == -1):
+            while visited[spare]:
+                spare += 1
+            w = spare
+        visited[w] = 1
+        path.append(w)
+    if (n > 1 or source != target):
+        path.append(target)
+    return path
+
+# 2-opt: reverses a stretch of the path whenever that makes it cheaper, until
+# no reversal does (or time_limit seconds pass). The endpoints stay in place.
+# A missing edge costs more than any whole path could, so reversals that
+# remove one always win. On directional graphs the reversed stretch is priced
+# from prefix sums of the path's cost walked either way.
+def two_opt(costs, path, time_limit = None):
+    deadline = None if time_limit == None else time.perf_counter() + time_limit
+    missing = 1 + sum(abs(c) for adjacent in costs for c in adjacent.values())
+    n = len(path)
+
+    def _cost(u, v):
+        return costs[u].get(v, missing)
+
+    forward = [0] * n # forward[k]: cost of path[0..k] walked as is.
+    backward = [0] * n # backward[k]: the same steps, each walked the other way.
+
+    def _prefix():
+        for k in range(1, n):
+            forward[k] = forward[k-1] + _cost(path[k-1], path[k])
+            backward[k] = backward[k-1] + _cost(path[k], path[k-1])
+
+    _prefix()
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 2):
+            a = path[i-1]
+            for j in range(i + 1, n - 1):
+                b = path[i]
+                c = path[j]
+                d = path[j+1]
+                change = (_cost(a, c) + _cost(b, d) - _cost(a, b) - _cost(c, d)
+                          + (backward[j] - backward[i]) - (forward[j] - forward[i]))
+                if change < -1e-9:
+                    path[i:j+1] = path[i:j+1][::-1]
+                    _prefix()
+                    improved = True
+            if (deadline != None and time.perf_counter() > deadline):
+                return path
+    return path
@@ -0,0 +1,107 @@
+from array import array
+from collections import OrderedDict
+import classes.Graph as Graph
+import classes.Search as Search
+import classes.ShortestPath as ShortestPath
+
+# ---------------------------------------------------------------------------- #
+#                                 Result Cache                                 #
+# ---------------------------------------------------------------------------- #
+
+# Returns how many bytes a result takes: the buffers it's made of (arrays,
+# numpy arrays), or of each item for tuples.
+def result_size(value):
+    if (isinstance(value, tuple)):
+        return sum(result_size(v) for v in value)
+    return memoryview(value).nbytes
+
+# LRU cache of search results (BFS/DFS orders, shortest path trees) for one
+# Graph, keyed by (source, algorithm, graph version). Any edit bumps
+# Graph.version, so stale results are never returned; they're dropped as soon
+# as the version changes. The results are indexed like view(), which is also
+# kept for as long as the graph doesn't change.
+class ResultCache:
+    def __init__(self, graph, max_bytes = 64 * 1024 * 1024):
+        self.graph = graph
+        self.max_bytes = max_bytes # Upper bound for the cached results' buffers.
+        self.entries = OrderedDict() # (source, algorithm, version) -> (result, size), oldest first.
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.version = graph.version
+        self.snapshot = None
+
+    # The representation results are indexed by: the graph's adjacency matrix
+    # if it keeps one, otherwise a CSR snapshot taken once per version.
+    def view(self):
+        self.expire()
+        if (self.graph.matrix != None):
+            return self.graph.matrix
+        if (self.snapshot == None):
+            self.snapshot = self.graph.freeze()
+        return self.snapshot
+
+    # Drops everything if the graph changed since the results were computed.
+    def expire(self):
+        if (self.version != self.graph.version):
+            self.clear()
+            self.version = self.graph.version
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.snapshot = None
+
+    # Returns the cached result of algorithm from the source label, computing
+    # it with compute(view, source id) on a miss. None if the source doesn't exist.
+    def get(self, algorithm, source, compute):
+        _view = self.view()
+        _key = (source, algorithm, self.version)
+        _entry = self.entries.get(_key)
+        if (_entry != None):
+            self.hits += 1
+            self.entries.move_to_end(_key)
+            return _entry[0]
+
+        self.misses += 1
+        _id = _view.id_get(source)
+        if (_id == None):
+            return None
+        _result = compute(_view, _id)
+        _size = result_size(_result)
+        if (_size > self.max_bytes):
+            return _result # Too big to keep.
+
+        # Evict the least recently used results until it fits.
+        while self.bytes + _size > self.max_bytes:
+            _, (_, _old) = self.entries.popitem(last=False)
+            self.bytes -= _old
+        self.entries[_key] = (_result, _size)
+        self.bytes += _size
+        return _result
+
+    # Vertex ids in BFS order from the source label.
+    def bfs(self, source):
+        return self.get("bfs", source, lambda view, s: array("q", Search.bfs(view, s)))
+
+    # Vertex ids in DFS order from the source label.
+    def dfs(self, source):
+        return self.get("dfs", source, lambda view, s: array("q", Search.dfs(view, s)))
+
+    # (dist, pred) from the source label, see ShortestPath.dijkstra.
+    def dijkstra(self, source):
+        def _compute(view, s):
+            if (isinstance(view, Graph.AdjacencyMatrix)):
+                return ShortestPath.dijkstra_matrix(view, s)
+            return ShortestPath.dijkstra(view, s)
+        return self.get("dijkstra", source, _compute)
+
+    # Returns a dict with the hit/miss counters and current size.
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,251 @@
+from array import array
+import classes.Graph as Graph
+
+# ---------------------------------------------------------------------------- #
+#                                Graph Searches                                #
+# ---------------------------------------------------------------------------- #
+#
+# Searches run over an integer indexed representation, a FrozenGraph
+# (Graph.freeze()) or an AdjacencyMatrix (Graph.matrix), and follow edge
+# direction. They are generators yielding vertex ids in visit order, so the
+# caller decides what to do with each vertex as it's reached.
+
+# ----------------------------- Deep First Search ---------------------------- #
+# Iterative, visits in the same order as the recursive version would, without
+# being bound by the recursion limit.
+def dfs(view, source):
+    visited = bytearray(view.vertex_count())
+    visited[source] = 1
+    yield source
+
+    # CSR snapshots keep an explicit stack of (vertex, next edge position) in
+    # two flat arrays: 16 bytes per level of depth.
+    if (isinstance(view, Graph.FrozenGraph)):
+        offsets = view.offsets
+        targets = view.targets
+        stack = array("q", [source])
+        positions = array("q", [offsets[source]])
+        while stack:
+            v = stack[-1]
+            k = positions[-1]
+            end = offsets[v+1]
+            # Skip the already visited adjacent vertices.
+            while k < end and visited[targets[k]]:
+                k += 1
+            if k == end:
+                stack.pop()
+                positions.pop()
+                continue
+            w = targets[k]
+            positions[-1] = k + 1
+            visited[w] = 1
+            yield w
+            stack.append(w)
+            positions.append(offsets[w])
+        return
+
+    # Otherwise keep a stack of iterators over each vertex's adjacent vertices.
+    stack = [iter(view.adjacent(source))]
+    while stack:
+        for w in stack[-1]:
+            if not visited[w]:
+                visited[w] = 1
+                yield w
+                stack.append(iter(view.adjacent(w)))
+                break
+        else:
+            stack.pop()
+
+# ---------------------------- Breadth First Search --------------------------- #
+# mode "top_down" (default) is the classic queue based search. mode
+# "direction_optimizing" needs a FrozenGraph and switches to bottom-up levels
+# on large frontiers, see bfs_direction_optimizing. mode "numpy" needs a
+# FrozenGraph and numpy, see bfs_levels. All reach the same vertices at the
+# same depths; within a level the order may differ.
+def bfs(view, source, mode = "top_down"):
+    if (mode == "direction_optimizing"):
+        yield from bfs_direction_optimizing(view, source)
+        return
+    if (mode == "numpy"):
+        yield from bfs_numpy_order(view, source)
+        return
+    if (mode != "top_down"):
+        raise ValueError(f"Unknown BFS mode {mode!r}.")
+
+    visited = bytearray(view.vertex_count())
+    visited[source] = 1
+
+    # The queue is a flat array read from the front through a cursor.
+    queue = array("q", [source])
+    head = 0
+    while head < len(queue):
+        v = queue[head]
+        head += 1
+        yield v
+        for w in view.adjacent(v):
+            if not visited[w]:
+                visited[w] = 1
+                queue.append(w)
+
+# Level synchronous BFS that picks, level by level, the cheaper direction
+# (Beamer et al.):
+#   top-down:  every frontier vertex checks it's adjacent vertices.
+#   bottom-up: every unvisited vertex checks it's inbound vertices for one in
+#              the frontier, stopping at the first found.
+# It goes bottom-up once the frontier's edges outnumber 1/alpha of the edges
+# left to explore, and back top-down once the frontier holds less than 1/beta
+# of the vertices. Yields the vertices level by level.
+def bfs_direction_optimizing(view, source, alpha = 14, beta = 24):
+    n = view.vertex_count()
+    offsets = view.offsets
+    targets = view.targets
+    in_offsets = view.in_offsets
+    in_targets = view.in_targets
+
+    visited = bytearray(n)
+    visited[source] = 1
+    yield source
+
+    frontier = [source]
+    remaining = None # Unvisited vertices, only tracked once bottom-up runs.
+    unexplored = offsets[n] - (offsets[source+1] - offsets[source]) # Edges out of unvisited vertices.
+    bottom_up = False
+
+    while frontier:
+        frontier_edges = sum(offsets[v+1] - offsets[v] for v in frontier)
+        if (not bottom_up and frontier_edges * alpha > unexplored):
+            bottom_up = True
+        elif (bottom_up and len(frontier) * beta < n):
+            bottom_up = False
+
+        following = []
+        if (bottom_up):
+            in_frontier = bytearray(n)
+            for v in frontier:
+                in_frontier[v] = 1
+            if (remaining == None):
+                remaining = [u for u in range(n) if not visited[u]]
+            else:
+                remaining = [u for u in remaining if not visited[u]]
+            for u in remaining:
+                for k in range(in_offsets[u], in_offsets[u+1]):
+                    if in_frontier[in_targets[k]]:
+                        visited[u] = 1
+                        following.append(u)
+                        break
+        else:
+            for v in frontier:
+                for k in range(offsets[v], offsets[v+1]):
+                    w = targets[k]
+                    if not visited[w]:
+                        visited[w] = 1
+                        following.append(w)
+
+        unexplored -= sum(offsets[w+1] - offsets[w] for w in following)
+        yield from following
+        frontier = following
+
+# Gathers the adjacency slices of many vertices at once from numpy CSR arrays.
+# Returns numpy arrays (owner, adjacent) with an entry per edge: adjacent is
+# the edge's target and owner the position in vertices of the vertex it
+# leaves. The slices are read back to back: each slice start repeated over
+# it's length, plus the offset inside the slice.
+def adjacency_gather(offsets, targets, vertices):
+    np = Graph.np
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    ends = np.cumsum(counts)
+    positions = np.arange(int(counts.sum())) + np.repeat(starts - (ends - counts), counts)
+    return np.repeat(np.arange(len(vertices)), counts), targets[positions]
+
+# Frontier at a time BFS with numpy over a FrozenGraph. Each level gathers the
+# adjacency slices of the whole frontier into one array, drops the visited
+# vertices and keeps one parent for each new one. Returns numpy
+# arrays (level, parent): the depth of each vertex and the vertex it was
+# reached from, -1 for unreachable vertices (and the source's parent).
+def bfs_levels(view, source):
+    np = Graph.np
+    n = view.vertex_count()
+    offsets = np.frombuffer(view.offsets, dtype=np.int64)
+    targets = np.frombuffer(view.targets, dtype=np.int32)
+
+    level = np.full(n, -1, dtype=np.int64)
+    parent = np.full(n, -1, dtype=np.int64)
+    level[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    depth = 0
+
+    while frontier.size:
+        depth += 1
+        owner, reached = adjacency_gather(offsets, targets, frontier)
+        if (reached.size == 0):
+            break
+        sources = frontier[owner]
+
+        fresh = level[reached] == -1
+        reached = reached[fresh]
+        sources = sources[fresh]
+        # A vertex may be reached from many frontier vertices. Scatter the
+        # parents (the last write wins), then keep the one pair per vertex
+        # that wrote it: a cheaper de-duplication than sorting.
+        parent[reached] = sources
+        frontier = reached[parent[reached] == sources].astype(np.int64)
+        level[frontier] = depth
+
+    return level, parent
+
+# Vertex ids in BFS order (level by level) from bfs_levels.
+def bfs_numpy_order(view, source):
+    np = Graph.np
+    level, _ = bfs_levels(view, source)
+    order = np.argsort(level, kind="stable")
+    yield from order[level[order] >= 0].tolist()
+
+# ------------------------- Multi Source BFS (bit parallel) ------------------- #
+# Hop distances from many sources in one walk per 64 of them: every vertex
+# keeps a 64 bit mask of the sources that reached it, and each level pushes the
+# newly set bits along the edges of the vertices that got any. A vertex reached
+# by many sources at the same depth is expanded once for all of them.
+# Returns a numpy int32 array dist[i, v], the hops from sources[i] to v
+# (-1 if unreachable). Needs a FrozenGraph and numpy.
+def multi_source_bfs(view, sources):
+    np = Graph.np
+    n = view.vertex_count()
+    dist = np.full((len(sources), n), -1, dtype=np.int32)
+    for _first in range(0, len(sources), 64):
+        multi_source_bfs_batch(view, sources[_first:_first+64], dist[_first:_first+64])
+    return dist
+
+# Runs up to 64 sources, filling their rows of dist.
+def multi_source_bfs_batch(view, sources, dist):
+    np = Graph.np
+    n = view.vertex_count()
+    offsets = np.frombuffer(view.offsets, dtype=np.int64)
+    targets = np.frombuffer(view.targets, dtype=np.int32)
+    bit = [np.uint64(1) << np.uint64(b) for b in range(len(sources))]
+
+    seen = np.zeros(n, dtype=np.uint64) # Sources that reached each vertex.
+    fresh = np.zeros(n, dtype=np.uint64) # Sources that reached it on the last level.
+    for b, s in enumerate(sources):
+        seen[s] |= bit[b]
+        fresh[s] |= bit[b]
+        dist[b, s] = 0
+
+    depth = 0
+    active = np.flatnonzero(fresh)
+    while active.size:
+        depth += 1
+        owner, reached = adjacency_gather(offsets, targets, active)
+        if (reached.size == 0):
+            break
+        masks = fresh[active][owner]
+
+        fresh = np.zeros(n, dtype=np.uint64)
+        np.bitwise_or.at(fresh, reached, masks)
+        fresh &= ~seen
+        seen |= fresh
+
+        active = np.flatnonzero(fresh)
+        reached = fresh[active]
+        for b in range(len(sources)):
+            dist[b, active[(reached & bit[b]) != 0]] = depth
@@ -0,0 +1,290 @@
+import heapq
+import math
+import os
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import classes.Graph as Graph
+import classes.GraphFile as GraphFile
+
+# ---------------------------------------------------------------------------- #
+#                                Shortest Paths                                #
+# ---------------------------------------------------------------------------- #
+#
+# Shortest path algorithms over an integer indexed representation (see
+# Graph.freeze() and Graph.matrix_enable()). Results are per vertex id:
+# dist[v] is the distance from the source (math.inf if unreachable) and
+# pred[v] the previous vertex on that path (-1 for the source and unreachable
+# vertices). On non weighted graphs every edge counts as 1.
+
+# Returns the CSR weights to use, checking they suit Dijkstra.
+def edge_weights(view):
+    if (not view.weighted):
+        return None
+    for w in view.weights:
+        if w < 0:
+            raise ValueError("Dijkstra does not support negative edge weights.")
+    return view.weights
+
+# -------------------------------- Dijkstra --------------------------------- #
+# Binary heap with lazy deletion: a vertex may be pushed more than once, stale
+# entries are skipped when popped. O((V + E) log V).
+def dijkstra(view, source):
+    n = view.vertex_count()
+    offsets = view.offsets
+    targets = view.targets
+    weights = edge_weights(view)
+
+    dist = array("d", [math.inf]) * n
+    pred = array("q", [-1]) * n
+    done = bytearray(n)
+    dist[source] = 0
+    heap = [(0.0, source)]
+
+    while heap:
+        d, v = heapq.heappop(heap)
+        if done[v]:
+            continue
+        done[v] = 1
+        for k in range(offsets[v], offsets[v+1]):
+            w = targets[k]
+            if done[w]:
+                continue
+            nd = d + (weights[k] if weights != None else 1)
+            if nd < dist[w]:
+                dist[w] = nd
+                pred[w] = v
+                heapq.heappush(heap, (nd, w))
+
+    return dist, pred
+
+# ------------------------- Dijkstra (Adjacency Matrix) ------------------------ #
+# O(V^2) Dijkstra over an AdjacencyMatrix, the right fit for dense graphs: each
+# step picks the closest unfinished vertex with a masked argmin and relaxes
+# it's whole row at once with numpy. Returns numpy arrays.
+def dijkstra_matrix(matrix, source):
+    np = Graph.np
+    n = matrix.vertex_count()
+    present = matrix.present[:n, :n]
+    weights = matrix.weights[:n, :n] if matrix.weighted else np.ones((n, n))
+    if (matrix.weighted and (weights[present] < 0).any()):
+        raise ValueError("Dijkstra does not support negative edge weights.")
+
+    # cost[u, v] is the weight of u -> v, inf without an edge. On non directional
+    # graphs an edge stored as v -> u also counts, the lighter one if both exist.
+    cost = np.where(present, weights, np.inf)
+    if (not matrix.directional):
+        cost = np.minimum(cost, cost.T)
+
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0
+    # Distances of the unfinished vertices, finished ones are set to inf so
+    # argmin skips them. open_mask is the same thing as booleans.
+    open_dist = dist.copy()
+    open_mask = np.ones(n, dtype=bool)
+    candidate = np.empty(n)
+    better = np.empty(n, dtype=bool)
+
+    for _ in range(n):
+        u = int(open_dist.argmin())
+        if (open_dist[u] == np.inf):
+            break # Everything left is unreachable.
+        open_dist[u] = np.inf
+        open_mask[u] = False
+        np.add(cost[u], dist[u], out=candidate)
+        np.less(candidate, dist, out=better)
+        better &= open_mask
+        dist[better] = candidate[better]
+        open_dist[better] = candidate[better]
+        pred[better] = u
+
+    return dist, pred
+
+# -------------------------------- All Pairs --------------------------------- #
+# Distances from many sources, spread over a pool of processes. The graph is
+# written once to a temporary binary graph file that every worker memory maps
+# (see GraphFile.load_binary), so it's shared between them instead of being
+# sent along with each task.
+
+worker_view = None # The mapped FrozenGraph, in each worker process.
+
+def worker_init(path):
+    global worker_view
+    worker_view = GraphFile.load_binary(path)
+
+# Runs Dijkstra from every source in the chunk. Returns [(source, dist)].
+def worker_run(sources):
+    return [(s, dijkstra(worker_view, s)[0]) for s in sources]
+
+# Yields (source, dist) for every source (all vertices by default), as the
+# workers finish them, in no particular order. workers defaults to the number
+# of CPUs; chunk_size sources go to a worker at a time.
+def distances_from(frozen, sources = None, workers = None, chunk_size = 16):
+    if (sources == None):
+        sources = range(frozen.vertex_count())
+    sources = list(sources)
+    _chunks = [sources[i:i+chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    _fd, _path = tempfile.mkstemp(suffix=".graph")
+    os.close(_fd)
+    try:
+        GraphFile.save_binary(frozen, _path)
+        with ProcessPoolExecutor(workers, initializer=worker_init, initargs=(_path,)) as _pool:
+            _futures = [_pool.submit(worker_run, c) for c in _chunks]
+            try:
+                for _future in as_completed(_futures):
+                    yield from _future.result()
+            finally:
+                # Stopped early: don't run the chunks nobody will read.
+                for _future in _futures:
+                    _future.cancel()
+    finally:
+        os.remove(_path)
+
+# Returns the all pairs distance matrix as a numpy array, row s holding the
+# distances from vertex s. With path, the matrix is a numpy memmap of that
+# file instead, so it doesn't need to fit in memory.
+def all_pairs(frozen, path = None, workers = None, chunk_size = 16):
+    np = Graph.np
+    n = frozen.vertex_count()
+    if (path != None):
+        _matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n, n))
+    else:
+        _matrix = np.empty((n, n))
+    for _source, _dist in distances_from(frozen, None, workers, chunk_size):
+        _matrix[_source] = np.frombuffer(_dist, dtype=np.float64)
+    if (path != None):
+        _matrix.flush()
+    return _matrix
+
+# ----------------------------- Point to Point ------------------------------- #
+# Shortest path between two vertices, stopping as soon as it's known instead of
+# settling the whole graph. Modes:
+#   "dijkstra"       plain Dijkstra, stopped once target is settled.
+#   "bidirectional"  Dijkstra from both ends at once (uses the inbound arrays),
+#                    done when the two searches can't improve the best meeting.
+#   "astar"          A*, guided by heuristic(v): a lower bound of the distance
+#                    from v to target. Defaults to straight line distance
+#                    between vertex positions (see Graph.vertex_position).
+# Returns (distance, path as a list of ids), (math.inf, []) if unreachable.
+def shortest_path(view, source, target, mode = "bidirectional", heuristic = None):
+    edge_weights(view)
+    if (mode == "dijkstra"):
+        return astar(view, source, target, lambda v: 0)
+    if (mode == "astar"):
+        if (heuristic == None):
+            heuristic = euclidean(view, target)
+        return astar(view, source, target, heuristic)
+    if (mode == "bidirectional"):
+        return bidirectional(view, source, target)
+    raise ValueError(f"Unknown shortest path mode {mode!r}.")
+
+# Straight line distance to target, from the positions of a FrozenGraph.
+# Only a valid A* heuristic if no edge is shorter than the distance between
+# it's endpoints' positions.
+def euclidean(view, target):
+    positions = view.positions
+    if (positions == None or positions[target] == None):
+        raise ValueError("A* needs vertex positions, or a heuristic.")
+    goal = positions[target]
+    return lambda v: math.dist(positions[v], goal)
+
+# True if every vertex has a position and no edge weighs less than the straight
+# line between it's endpoints, so euclidean never overestimates. Non weighted
+# edges count 1. O(V + E).
+def euclidean_admissible(view):
+    positions = view.positions
+    if (positions == None or None in positions):
+        return False
+    offsets = view.offsets
+    targets = view.targets
+    weights = view.weights if view.weighted else None
+    for v in range(view.vertex_count()):
+        _position = positions[v]
+        for k in range(offsets[v], offsets[v+1]):
+            w = weights[k] if weights != None else 1
+            if w < math.dist(_position, positions[targets[k]]):
+                return False
+    return True
+
+# Follows pred from target back to source.
+def path_build(pred, source, target):
+    path = [target]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return path
+
+# A* with a lazy deletion heap. With heuristic 0 it is Dijkstra stopped early.
+def astar(view, source, target, heuristic):
+    offsets = view.offsets
+    targets = view.targets
+    weights = view.weights if view.weighted else None
+
+    dist = {source: 0.0}
+    pred = {source: -1}
+    done = set()
+    heap = [(heuristic(source), 0.0, source)]
+    while heap:
+        _, d, v = heapq.heappop(heap)
+        if v in done:
+            continue
+        if v == target:
+            return d, path_build(pred, source, target)
+        done.add(v)
+        for k in range(offsets[v], offsets[v+1]):
+            w = targets[k]
+            if w in done:
+                continue
+            nd = d + (weights[k] if weights != None else 1)
+            if nd < dist.get(w, math.inf):
+                dist[w] = nd
+                pred[w] = v
+                heapq.heappush(heap, (nd + heuristic(w), nd, w))
+    return math.inf, []
+
+# Bidirectional Dijkstra: a forward search over the outbound arrays and a
+# backward one over the inbound arrays, always expanding the smaller heap top.
+def bidirectional(view, source, target):
+    if (source == target):
+        return 0.0, [source]
+    weighted = view.weighted
+    # Per direction: arrays, distances, predecessors, settled set and heap.
+    sides = [
+        (view.offsets, view.targets, view.weights, {source: 0.0}, {source: -1}, set(), [(0.0, source)]),
+        (view.in_offsets, view.in_targets, view.in_weights, {target: 0.0}, {target: -1}, set(), [(0.0, target)]),
+    ]
+    best = math.inf
+    meeting = -1
+
+    while sides[0][6] and sides[1][6]:
+        # Nothing shorter than best can still be found.
+        if (sides[0][6][0][0] + sides[1][6][0][0] >= best):
+            break
+        side = 0 if sides[0][6][0][0] <= sides[1][6][0][0] else 1
+        offsets, targets, weights, dist, pred, done, heap = sides[side]
+        other_dist = sides[1 - side][3]
+
+        d, v = heapq.heappop(heap)
+        if v in done:
+            continue
+        done.add(v)
+        for k in range(offsets[v], offsets[v+1]):
+            w = targets[k]
+            nd = d + (weights[k] if weighted else 1)
+            if nd < dist.get(w, math.inf):
+                dist[w] = nd
+                pred[w] = v
+                heapq.heappush(heap, (nd, w))
+            # Does the path through v -> w, then on to the other end, beat the best?
+            if (w in other_dist and dist[w] + other_dist[w] < best):
+                best = dist[w] + other_dist[w]
+                meeting = w
+
+    if (meeting == -1):
+        return math.inf, []
+    _forward = path_build(sides[0][4], source, meeting)
+    _backward = path_build(sides[1][4], target, meeting)
+    _backward.reverse()
+    return best, _forward + _backward[1:]
@@ -17,9 +17,14 @@
 import os
 import platform
 import sys
-import itertools
+import math
+import classes.Coloring as Coloring
 import classes.Graph as Graph
-from collections import deque
+import classes.GraphFile as GraphFile
+import classes.Hamiltonian as Hamiltonian
+import classes.ResultCache as ResultCache
+import classes.Search as Search
+import classes.ShortestPath as ShortestPath
 
 LINUX = (platform.system() == "Linux")
 WINDOWS = (platform.system() == "Windows")
@@ -34,7 +39,9 @@ if (LINUX):
 
 
 _graph = None # The current graph we have created.
+_cache = None # Search results for the current graph.
 _warning = "" # Warning message to be displayed, even after clearing console. 
+_searchTimeLimit = 10 # Seconds the exact coloring and the Hamiltonian path heuristic may search for better answers.
 
 # Common texts
 _invalidOption = "\nInvalid Option."
@@ -137,6 +144,19 @@ def input_edge():
 	# Return all the info. This can be used to create new edges or access existing.
 	return [_origin, _dest, _edge, _reciprocate]
 
+# Returns the result cache of the current graph, starting a new one if the graph was replaced.
+def graph_cache():
+	global _cache
+	if (_cache == None or _cache.graph != _graph):
+		_cache = ResultCache.ResultCache(_graph)
+	return _cache
+
+# Returns the integer indexed representation the algorithms run on: the
+# adjacency matrix if the graph keeps one, otherwise a CSR snapshot of the
+# lists, only taken again after the graph changes.
+def graph_view():
+	return graph_cache().view()
+
 # Prints the adjacency matrix, being the graph Edge-Weighted or not, Directed or not.
 def print_matrix():
 	clear()
@@ -146,7 +166,7 @@ def print_matrix():
 	def _sort(e):
 		return e.label
 
-	_graph.vertices.sort(key=lambda x: x.label)
+	_graph.vertices_sort(lambda x: x.label)
 
 	# Horizontal Header
 	for v in _graph.vertices:
@@ -154,6 +174,21 @@ def print_matrix():
 	print("  " + " ".join(_labels))
 	print(" ")
 
+	# Read straight from the matrix representation when the graph keeps one.
+	_matrix = _graph.matrix
+	if (_matrix != None):
+		_rows = [_matrix.id_get(l) for l in _labels]
+		_present = _matrix.present[Graph.np.ix_(_rows, _rows)]
+		_weights = Graph.np.where(_present, _matrix.weights[Graph.np.ix_(_rows, _rows)], 0)
+		if (not _graph.directional):
+			_weights = _weights + _weights.T
+		Graph.np.fill_diagonal(_weights, 0)
+		for i in range(0, len(_labels)):
+			print(f"{_labels[i]} " + " ".join(f"{_w:g}" for _w in _weights[i]))
+			print(" ")
+		input_char(_inputContinue)
+		return
+
 	# Line by line
 	for v in _graph.vertices:
 		_line = v.label + " "
@@ -183,17 +218,13 @@ def print_list():
 
 	for v in _graph.vertices:
 		_listing = []
-		for e in _graph.edges:
-			if (e.origin == v):
-				if (_graph.weighted):
-					_listing.append(f"({e.destination.label}-{str(e.weight)})")
-				else:
-					_listing.append(e.destination.label)
-			if (e.destination == v and not _graph.directional):
-				if (_graph.weighted):
-					_listing.append(f"({e.origin.label}-{str(e.weight)})")
-				else:
-					_listing.append(e.origin.label)
+		for e in _graph.vertex_get_edges(v.label):
+			# Inbound edges only show up here on non directional graphs.
+			_other = e.destination if (e.origin == v) else e.origin
+			if (_graph.weighted):
+				_listing.append(f"({_other.label}-{str(e.weight)})")
+			else:
+				_listing.append(_other.label)
 
 		_s = ", ".join(_listing)
 		print(f"[{v.label}] adjacent to [{_s}]")
@@ -229,6 +260,7 @@ def menu():
 		print("""
 		# Main Menu
 		[   1   ] - Create graph
+		[   3   ] - Open graph from file
 		[ 0 / Q ] - Quit
 		""")
 	else:
@@ -236,6 +268,8 @@ def menu():
 		# Main Menu
 		[   1   ] - Create new graph
 		[   2   ] - Edit existing Graph
+		[   3   ] - Open graph from file
+		[   4   ] - Save graph (binary)
 		[ 0 / Q ] - Quit
 		""")
 	
@@ -260,6 +294,20 @@ def menu():
 				if(menu_graph()):
 					break
 			return False
+		case (3): # Open graph from file
+			clear_warn()
+			if (open_file()):
+				while(True):
+					if(menu_graph()):
+						break
+			return False
+		case (4): # Save graph to a binary file
+			clear_warn()
+			if (_graph == None):
+				set_warn(_invalidOption)
+				return False
+			save_file()
+			return False
 		case (0): # Quit
 			clear_warn()
 			return True
@@ -274,14 +322,21 @@ def menu_create_graph():
 	# Gather if its directional and/or weighted
 	_weighted = input_bool("Weighted Graph?")
 	_directional = input_bool("Directional?")
+	# The matrix representation needs numpy.
+	_matrix = False
+	if (Graph.np != None):
+		_matrix = input_bool("Keep an adjacency matrix?")
 	print("Weighted: " + str(_weighted))
 	print("Directional: " + str(_directional))
+	print("Adjacency matrix: " + str(_matrix))
 	_correct = input_bool("Is this correct?")
 
 	if _correct:
 		set_warn("Graph Created.")
 		# Create Graph object
 		_graph = Graph.Graph(_weighted, _directional)
+		if (_matrix):
+			_graph.matrix_enable()
 		while(True):
 			if (menu_graph()):
 				return True
@@ -363,6 +418,9 @@ def menu_graph():
 			source = input("Insira o vértice de origem: ")
 			print("DFS from source:", source)
 			source = _graph.vertex_get(source)
+			if (source == None):
+				set_warn("Vertex does not exist.")
+				return False
 			dfs(source)
 	
 			return False
@@ -370,14 +428,14 @@ def menu_graph():
 
 			clear_warn()
 
-			# Mark all the vertices as not visited
-			visited = [False] * len(_graph.vertices)
-
-			# Perform BFS traversal starting from vertex 0
+			# Perform BFS traversal starting from vertex 'source'
 			source = input("Insira o vértice de origem: ")
 			print("BFS starting from : "+source)
 			source = _graph.vertex_get(source)
-			bfs(source, visited)
+			if (source == None):
+				set_warn("Vertex does not exist.")
+				return False
+			bfs(source)
 
 			return False
 		case (8): # Dijkistra
@@ -388,36 +446,53 @@ def menu_graph():
 			source = input("Insira o vértice de origem: ")
 			print("Dijkistra starting from : "+source)
 			source = _graph.vertex_get(source)
-			dijkstra(source)	
+			if (source == None):
+				set_warn("Vertex does not exist.")
+				return False
+			# A destination turns it into a single point to point query.
+			target = input("Insira o vértice de destino (vazio para todos): ")
+			if (target != ""):
+				target = _graph.vertex_get(target)
+				if (target == None):
+					set_warn("Vertex does not exist.")
+					return False
+				# Or, through every vertex on the way.
+				if (input_bool("Pass through every vertex?")):
+					hamiltonian_path(source, target)
+					return False
+				shortest_path(source, target)
+				return False
+			dijkstra(source)
 			return False
 		case (9): # Create a Non Weighted and Non Directional Graph
 
 			clear_warn()
 
-			_graph.vertex_add("A")
-			_graph.vertex_add("B")
-			_graph.vertex_add("C")
-			_graph.vertex_add("D")
-			_graph.vertex_add("E")
-			_graph.vertex_add("F")
-
-			_graph.edge_add("A", "B", 0)
-			_graph.edge_add("A", "C", 0)
-			_graph.edge_add("A", "D", 0)
-			_graph.edge_add("B", "A", 0)
-			_graph.edge_add("B", "D", 0)
-			_graph.edge_add("C", "A", 0)
-			_graph.edge_add("C", "E", 0)
-			_graph.edge_add("C", "F", 0)
-			_graph.edge_add("E", "C", 0)
-			_graph.edge_add("E", "F", 0)
-			_graph.edge_add("F", "C", 0)
-			_graph.edge_add("F", "E", 0)
+			_graph.vertices_add(["A", "B", "C", "D", "E", "F"])
+
+			_graph.edges_add([
+				("A", "B", 0),
+				("A", "C", 0),
+				("A", "D", 0),
+				("B", "A", 0),
+				("B", "D", 0),
+				("C", "A", 0),
+				("C", "E", 0),
+				("C", "F", 0),
+				("E", "C", 0),
+				("E", "F", 0),
+				("F", "C", 0),
+				("F", "E", 0),
+			])
 
 			return False
 		
 		case ('c'): # Colorization Method 
-			brute_force(_graph.vertices[0], _graph.vertices[-1])
+			clear_warn()
+			while(True):
+				if (menu_coloring()):
+					break
+			return False
 
 		case (0):
 			clear_warn()
@@ -426,6 +501,55 @@ def menu_graph():
 	set_warn(_invalidOption)
 	return False
 
+# ------------------------------- Coloring Menu ------------------------------ #
+def menu_coloring():
+	clear()
+	print("""
+	# Coloring Menu
+	[   1   ] - DSATUR
+	[   2   ] - Welsh Powell (largest first)
+	[   3   ] - Welsh Powell (smallest last)
+	[   4   ] - Fewest colors (exact)
+	[   5   ] - Parallel (Jones Plassmann)
+	[   6   ] - Kept up to date with every edit
+	[ 0 / Q ] - Return to menu
+	""")
+	_opt = menu_input()
+
+	match(_opt):
+		case (1): # DSATUR
+			print_coloring("DSATUR", dsatur())
+			return False
+		case (2): # Welsh Powell, vertices by degree
+			print_coloring("Welsh Powell (largest first)", welsh_powell("largest_first"))
+			return False
+		case (3): # Welsh Powell, smallest last order
+			print_coloring("Welsh Powell (smallest last)", welsh_powell("smallest_last"))
+			return False
+		case (4): # Exact, gives up after _searchTimeLimit seconds
+			_coloring, _exact = chromatic()
+			if (_exact):
+				print_coloring("Fewest colors", _coloring)
+			else:
+				print_coloring(f"Best found in {_searchTimeLimit}s, not proved optimal", _coloring)
+			return False
+		case (5): # Jones Plassmann, over every CPU
+			if (Graph.np == None):
+				set_warn("Parallel coloring needs numpy.")
+				return False
+			print_coloring("Jones Plassmann", jones_plassmann())
+			return False
+		case (6): # Maintained by the graph, started on first use
+			_graph.coloring_enable()
+			print_coloring("Kept up to date", _graph.coloring.label_colors())
+			return False
+		case (0): # Return
+			clear_warn()
+			return True
+
+	set_warn(_invalidOption)
+	return False
+
 # ---------------------------- Vertex Editing Menu --------------------------- #
 def menu_vertex():
 	clear()
@@ -440,6 +564,7 @@ def menu_vertex():
 	[   2   ] - Remove Vertex
 	[   3   ] - Label Vertex
 	[   4   ] - List all Vertices
+	[   5   ] - Set Vertex Position
 	[ 0 / Q ] - Return to menu
 	""")
 	_opt = menu_input()
@@ -488,6 +613,23 @@ def menu_vertex():
 		case (4): # List vertices
 			set_warn(_graph.get_string_vertices())
 			return False
+		case (5): # Position Vertex
+			_label = input_char(_inputLabel)
+			if (not _graph.vertex_exists(_label)):
+				set_warn("Vertex does not exist.")
+				return False
+			# Coordinates separated by spaces, e.g. "3 4". Empty clears the position.
+			_text = input("Position (x y): ").split()
+			try:
+				_position = tuple(float(c) for c in _text) if _text else None
+			except ValueError:
+				set_warn("Invalid position.")
+				return False
+			if (_graph.vertex_position(_label, _position)):
+				set_warn("Vertex position set.")
+				return False
+			set_warn("Something went wrong while setting the position.")
+			return False
 		case (0): # Return
 			clear_warn()
 			return True
@@ -626,191 +768,204 @@ def menu_edges():
 
 # Open a .txt file to create a Graph
 def open_file():
-	pass
+	global _graph
+	clear()
 
-# ----------------------------- Deep First Search ---------------------------- #
-def dfs_rec(visited, source):
-    # Mark the current vertex as visited
-    visited[_graph.vertices.index(source)] = True
+	_path = input("File path: ")
+
+	# Reports how many edges have been read so far, on a single line.
+	def _progress(edges):
+		print(f"\rEdges read: {edges}", end="", flush=True)
+
+	try:
+		# Binary files are mapped as a snapshot, then turned into an editable graph.
+		if (GraphFile.is_binary(_path)):
+			_graph = GraphFile.load_binary(_path).thaw()
+		else:
+			_graph = GraphFile.read_graph(_path, _progress)
+	except OSError as e:
+		set_warn(f"Could not open [{_path}]: {e.strerror}.")
+		return False
+	except ValueError as e:
+		set_warn(f"Invalid graph file [{_path}], {e}.")
+		return False
+	print()
+
+	set_warn(f"Graph loaded: {len(_graph.vertices)} vertices, {_graph.edge_count()} edges.")
+	return True
 
-    
+# Saves the graph in the binary format (see GraphFile.save_binary), which
+# "Open graph from file" reads back.
+def save_file():
+	clear()
 
-    # Print the current vertex
-    print(source.label, end=" ")
+	_path = input("File path: ")
+	try:
+		GraphFile.save_binary(_graph, _path)
+	except OSError as e:
+		set_warn(f"Could not save [{_path}]: {e.strerror}.")
+		return False
+	except ValueError as e:
+		set_warn(f"Could not save [{_path}], {e}")
+		return False
 
-    # Recursively visit all adjacent vertices
-    # that are not visited yet
-    for i in _graph.vertex_get_neighbors(source.label):
-        if not visited[_graph.vertices.index(i)]:
-            dfs_rec(visited, i)
+	set_warn(f"Graph saved: {len(_graph.vertices)} vertices, {_graph.edge_count()} edges.")
+	return True
 
+# ----------------------------- Deep First Search ---------------------------- #
 def dfs(source):
 
     clear()
-    visited = [False] * len(_graph.vertices)
+    # Run over the integer indexed list (or matrix) representation.
+    view = graph_view()
+
+    # Print the vertices in the order the search reaches them
+    for v in graph_cache().dfs(source.label):
+        print(view.labels[v], end=" ")
 
-    # Call the recursive DFS function
-    dfs_rec(visited, source)
+    print()
+    input_char(_inputContinue)
 
 # ---------------------------- Breadth First Search --------------------------- #
 # Breadth First Search
-def bfs(source, visited):
+def bfs(source):
 
     clear()
-  
-    # Create a queue for BFS
-    q = deque()
-
-    # Mark the source node as visited and enqueue it
-    visited[_graph.vertices.index(source)] = True
-    q.append(source)
-
-    # Iterate over the queue
-    while q:
-      
-        # Dequeue a vertex from queue and print it
-        curr = q.popleft()
-        print(curr, end=" ")
-
-        # Get all adjacent vertices of the dequeued 
-        # vertex. If an adjacent has not been visited, 
-        # mark it visited and enqueue it
-        for v in _graph.vertex_get_neighbors(curr.label): 
-			# Get the vertex index
-            index = _graph.vertices.index(v)
-            if not visited[index]:
-                visited[index] = True
-                q.append(v)
+    # Run over the integer indexed list (or matrix) representation.
+    view = graph_view()
+
+    # Print the vertices in the order the search reaches them
+    for v in graph_cache().bfs(source.label):
+        print(view.labels[v], end=" ")
+
+    print()
+    input_char(_inputContinue)
 # ---------------------------- ----------------- --------------------------- #
 
 
-# ---------------------------- Brute Force --------------------------- #
-def brute_force(start, end):
-    vertices = _graph.vertices
-    min_path = None
-    min_length = float('inf')
+# Prints a coloring (label -> color), and how many colors it used.
+def print_coloring(name, coloring):
+    clear()
+    print(f"{name}: {len(set(coloring.values()))} colors")
+    for label, color in coloring.items():
+        print(f"[{label}] \t{color}")
+    input_char(_inputContinue)
 
-    for perm in itertools.permutations(vertices):
-        if perm[0] == start and perm[-1] == end:
-            length = sum(_graph[perm[i]][perm[i+1]] for i in range(len(perm) - 1))
-            if length < min_length:
-                min_length = length
-                min_path = perm
+# -------------------------- Caminho Hamiltoniano ------------------------- #
+# Prints the shortest path from start to end through every vertex: exact
+# (Held-Karp) while it's tables fit in memory, nearest neighbor + 2-opt after.
+def hamiltonian_path(start, end):
 
-    return min_path, min_length
+    clear()
+    # Needs the CSR snapshot, even if the graph keeps a matrix.
+    view = _graph.freeze() if (_graph.matrix != None) else graph_view()
+    # Held-Karp needs numpy, without it always take the heuristic.
+    _mode = "auto" if (Graph.np != None) else "heuristic"
+    dist, path, exact = Hamiltonian.hamiltonian_path(view, view.id_get(start.label), view.id_get(end.label), _mode, time_limit=_searchTimeLimit)
+
+    if (dist == math.inf):
+        if (exact):
+            print(f"No path from [{start.label}] to [{end.label}] passes through every vertex.")
+        else:
+            print(f"No path from [{start.label}] to [{end.label}] through every vertex was found.")
+    else:
+        print(f"Distance: {dist:g}" + ("" if exact else " (heuristic, may not be the shortest)"))
+        print("Path: " + " -> ".join(view.labels[v] for v in path))
+
+    input_char(_inputContinue)
 
 # ---------------------------- DSATUR --------------------------- #
 def dsatur():
-    # Inicializa as cores e saturação
-    coloracao = {vertice: -1 for vertice in _graph.vertices}
-    saturacao = {vertice: 0 for vertice in _graph.vertices}
-    grau = {vertice: len(adjacentes) for vertice, adjacentes in _graph.items()}
-    # Lista de cores usadas
-    cores_usadas = set()
-
-    # Função para atualizar a saturação dos vértices adjacentes
-    def atualizar_saturacao(vertice):
-        for adj in _graph.vertex_get(vertice.vertices):
-            if coloracao[adj] == -1:
-                saturacao[adj] = len(set(coloracao[adj_2] for adj_2 in _graph.vertex_get(adj) if coloracao[adj_2] != -1))
-
-    # Colorir o vértice de maior grau inicialmente
-    vertice_inicial = max(_graph.vertices, key=lambda x: grau[x])
-    coloracao[vertice_inicial] = 0
-    cores_usadas.add(0)
-    atualizar_saturacao(vertice_inicial)
-
-    while -1 in coloracao.values():
-        vertice = max((v for v in _graph.vertices if coloracao[v] == -1), key=lambda x: (saturacao[x], grau[x]))
-        cor = next((c for c in range(len(_graph.vertices)) if c not in {coloracao[adj] for adj in _graph.vertices[vertice]}), len(cores_usadas))
-        coloracao[vertice] = cor
-        cores_usadas.add(cor)
-        atualizar_saturacao(vertice)
-
-    return coloracao
-
-# ---------------------------- Welsh Powell --------------------------- #
-def welsh_powell():
+    # Trabalha sobre a representação do grafo com vértices indexados por inteiros
+    view = graph_view()
+    coloracao = Coloring.dsatur(view)
 
-    # Ordena os vértices pelo grau (número de arestas) em ordem decrescente
-    vertices = _graph.vertices
-    coloracao = {}
-    cor = 0
+    return {view.labels[v]: coloracao[v] for v in range(view.vertex_count())}
 
-    for vertice in vertices:
-        if vertice not in coloracao:
-            cor += 1
-            coloracao[vertice] = cor
-            for adjacente in _graph.vertex_get(vertice):
-                if adjacente not in coloracao:
-                    nao_pode_usar = [coloracao[vizinho] for vizinho in _graph.vertices[adjacente] if vizinho in coloracao]
-                    if cor not in nao_pode_usar:
-                        coloracao[adjacente] = cor
-
-    return 
+# ---------------------------- Welsh Powell --------------------------- #
+def welsh_powell(ordem = "largest_first"):
+    # Trabalha sobre a representação do grafo com vértices indexados por inteiros
+    view = graph_view()
+    # Ordena os vértices pelo grau (ou pela ordem smallest-last) e colore uma cor por vez
+    coloracao = Coloring.welsh_powell(view, ordem)
 
-# --------------------------------- Dijkstra ------------------------------- #
+    return {view.labels[v]: coloracao[v] for v in range(view.vertex_count())}
 
-	# A utility function to find the vertex with
-	# minimum distance value, from the set of vertices
-	# not yet included in shortest path tree
-def minDistance(dist, sptSet):
+# ----------------------------- Jones Plassmann ----------------------------- #
+def jones_plassmann():
+    # Os processos leem o snapshot CSR, mesmo se o grafo mantiver uma matriz
+    view = _graph.freeze() if (_graph.matrix != None) else graph_view()
+    coloracao = Coloring.jones_plassmann(view)
 
-    # Initialize minimum distance for next node
-    min = sys.maxsize
+    return {view.labels[v]: coloracao[v] for v in range(view.vertex_count())}
 
-    # Search not nearest vertex not in the
-    # shortest path tree
-    for u in range(V):
-        if dist[u] < min and sptSet[u] == False:
-            min = dist[u]
-            min_index = u
+# ----------------------------- Número Cromático ---------------------------- #
+def chromatic():
+    view = graph_view()
+    # Busca exata (branch and bound), devolve a melhor encontrada se o tempo acabar
+    coloracao, exata = Coloring.chromatic(view, _searchTimeLimit)
 
-    return min_index
+    return {view.labels[v]: coloracao[v] for v in range(view.vertex_count())}, exata
 
-# Function that implements Dijkstra's single source
-# shortest path algorithm for a graph represented
-# using adjacency matrix representation
+# --------------------------------- Dijkstra ------------------------------- #
+# Prints the shortest distance from source to every vertex, and the previous
+# vertex on that path.
 def dijkstra(source):
 
-    dist = [sys.maxsize] * len(_graph.vertices)
-    dist[source] = 0
-    sptSet = [False] * len(_graph.vertices)
-
-    for cout in range(len(_graph.vertices)):
-
-        # Pick the minimum distance vertex from
-        # the set of vertices not yet processed.
-        # x is always equal to src in first iteration
-        x = minDistance(dist, sptSet)
-
-        # Put the minimum distance vertex in the
-        # shortest path tree
-        sptSet[x] = True
-
-        # Update dist value of the adjacent vertices
-        # of the picked vertex only if the current
-        # distance is greater than new distance and
-        # the vertex in not in the shortest path tree
-        for y in range(len(_graph.vertices)): # ADAPTAR PRO CÓDIGO NOSSO <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<
-            if self.graph[x][y] > 0 and sptSe	[y] == False and \
-                    dist[y] > dist[x] + self.graph[x][y]: 
-                dist[y] = dist[x] + self.graph[x][y]
-
-    printSolution(dist)
-
-# Print the Dijkstra solution	 
-def printSolution(self, dist): # ADAPTAR PRO CÓDIGO NOSSO <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<
-        print("Vertex \tDistance from Source")
-        for node in range(len(_graph.vertices)):
-            print(node, "\t", dist[node])
+    clear()
+    # Run over the integer indexed list (or matrix) representation.
+    view = graph_view()
+
+    try:
+        dist, pred = graph_cache().dijkstra(source.label)
+    except ValueError as e:
+        print(e)
+        input_char(_inputContinue)
+        return
+
+    print("Vertex \tDistance \tPrevious")
+    for v in range(view.vertex_count()):
+        _dist = "-" if dist[v] == math.inf else f"{dist[v]:g}"
+        _pred = "-" if pred[v] == -1 else view.labels[pred[v]]
+        print(f"{view.labels[v]} \t{_dist} \t\t{_pred}")
+
+    input_char(_inputContinue)
+# Prints the shortest path from source to target, stopping the search early.
+# Uses A* when vertex positions make a valid heuristic, bidirectional Dijkstra otherwise.
+def shortest_path(source, target):
+
+    clear()
+    # Point to point queries need the CSR snapshot, even if the graph keeps a matrix.
+    view = _graph.freeze() if (_graph.matrix != None) else graph_view()
+    _mode = "bidirectional"
+    # A* with straight line distances, only when no edge is shorter than the
+    # distance between it's endpoints' positions: otherwise A* may miss shorter paths.
+    if (ShortestPath.euclidean_admissible(view)):
+        _mode = "astar"
+
+    try:
+        dist, path = ShortestPath.shortest_path(view, view.id_get(source.label), view.id_get(target.label), _mode)
+    except ValueError as e:
+        print(e)
+        input_char(_inputContinue)
+        return
+
+    if (dist == math.inf):
+        print(f"[{target.label}] can't be reached from [{source.label}].")
+    else:
+        print(f"Distance: {dist:g}")
+        print("Path: " + " -> ".join(view.labels[v] for v in path))
+
+    input_char(_inputContinue)
 # ---------------------------- ----------------- --------------------------- #
 
 # ----------------------------------------------------------------------------- #
 #                                   Main Loop                                   #
 # ----------------------------------------------------------------------------- #
 
-# Loop until menu told to quit.
-while(True):
-	if (menu()): 
-		break
+# Loop until menu told to quit. Only when run directly: the worker processes
+# of the parallel algorithms import this file again on Windows.
+if (__name__ == "__main__"):
+	while(True):
+		if (menu()): 
+			break
@@ -0,0 +1,107 @@
+import pytest
+import classes.Graph as Graph
+import classes.GraphFile as GraphFile
+
+# Builds a graph from (origin, destination, weight) tuples.
+def graph_build(weighted, directional, edges, isolated = ()):
+    _graph = Graph.Graph(weighted, directional)
+    _graph.vertices_add([o for o, _, _ in edges] + [d for _, d, _ in edges] + list(isolated))
+    _graph.edges_add(edges)
+    return _graph
+
+# Edges of a graph as a set of (origin, destination, weight) labels.
+def edge_set(graph):
+    return {(e.origin.label, e.destination.label, e.weight) for e in graph.edges if e != None}
+
+# Saves, loads and thaws a graph, returning (loaded snapshot, thawed graph).
+def round_trip(graph, tmp_path):
+    _path = tmp_path / "graph.bin"
+    GraphFile.save_binary(graph, _path)
+    assert GraphFile.is_binary(_path)
+    _frozen = GraphFile.load_binary(_path)
+    return _frozen, _frozen.thaw()
+
+@pytest.mark.parametrize("directional", [True, False])
+def test_round_trip(tmp_path, directional):
+    # One edge per pair, like the menus keep them; the last one points to a lower id.
+    _edges = [("São Paulo", "Itajaí", 2.5), ("Itajaí", "東京", 1), ("東京", "São Paulo", 0.125), ("東京", "東京", 3)]
+    _graph = graph_build(True, directional, _edges, isolated=["Ωmega"])
+    _frozen, _thawed = round_trip(_graph, tmp_path)
+
+    assert _frozen.directional == directional
+    assert _frozen.weighted
+    assert [_frozen.labels[i] for i in range(_frozen.vertex_count())] == [v.label for v in _graph.vertices]
+    assert _thawed.directional == directional
+    assert [v.label for v in _thawed.vertices] == [v.label for v in _graph.vertices]
+    assert edge_set(_thawed) == edge_set(_graph)
+    assert _thawed.edge_count() == _graph.edge_count()
+    # Whole weights come back as integers, the others as floats.
+    assert isinstance(_thawed.edge_get_weight("Itajaí", "東京"), int)
+    assert _thawed.edge_get_weight("東京", "São Paulo") == 0.125
+
+# A non directional pair stored both ways comes back both ways, with the lighter weight.
+def test_round_trip_both_ways(tmp_path):
+    _graph = graph_build(True, False, [("A", "B", 1), ("B", "A", 2), ("B", "C", 4)])
+    _frozen, _thawed = round_trip(_graph, tmp_path)
+
+    assert edge_set(_thawed) == {("A", "B", 1), ("B", "A", 1), ("B", "C", 4)}
+
+# Snapshots without forward keep each non directional pair once, from the lower id.
+def test_thaw_without_forward():
+    _graph = Graph.Graph(False, False)
+    _graph.vertices_add(["A", "B", "C"])
+    _graph.edges_add([("A", "B", 0), ("C", "B", 0)])
+    _frozen = _graph.freeze()
+    _frozen.forward = None
+    _thawed = _frozen.thaw()
+
+    assert edge_set(_thawed) == {("A", "B", 0), ("B", "C", 0)}
+
+def test_round_trip_positions(tmp_path):
+    _graph = graph_build(True, False, [("A", "B", 1)], isolated=["C"])
+    _graph.vertex_position("A", (0.5, -2.0))
+    _graph.vertex_position("C", (3.0, 4.0))
+    _frozen, _thawed = round_trip(_graph, tmp_path)
+
+    assert list(_frozen.positions) == [(0.5, -2.0), None, (3.0, 4.0)]
+    assert [v.position for v in _thawed.vertices] == [(0.5, -2.0), None, (3.0, 4.0)]
+
+def test_round_trip_empty_graph(tmp_path):
+    _frozen, _thawed = round_trip(Graph.Graph(False, True), tmp_path)
+
+    assert _frozen.vertex_count() == 0
+    assert _frozen.positions == None
+    assert len(_thawed.vertices) == 0
+
+def test_load_empty_file(tmp_path):
+    _path = tmp_path / "empty.bin"
+    _path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        GraphFile.load_binary(_path)
+
+def test_load_not_binary(tmp_path):
+    _path = tmp_path / "text.txt"
+    _path.write_text("2 1 0 0\nA B\n" * 10)
+    with pytest.raises(ValueError):
+        GraphFile.load_binary(_path)
+
+def test_load_truncated(tmp_path):
+    _graph = graph_build(True, True, [("A", "B", 1.5), ("B", "C", 2.5)])
+    _path = tmp_path / "graph.bin"
+    GraphFile.save_binary(_graph, _path)
+    _data = _path.read_bytes()
+
+    for _size in (GraphFile.BINARY_HEADER.size - 1, GraphFile.BINARY_HEADER.size, len(_data) - 8):
+        _path.write_bytes(_data[:_size])
+        with pytest.raises(ValueError):
+            GraphFile.load_binary(_path)
+
+# Non directional text files get one edge per pair, a reversed repeat is skipped.
+@pytest.mark.parametrize("chunk_size", [1, 65536])
+def test_read_graph_non_directional(tmp_path, chunk_size):
+    _path = tmp_path / "graph.txt"
+    _path.write_text("3 3 0 1\nA B 1\nB C 2\nB A 5\n", encoding="utf-8")
+    _graph = GraphFile.read_graph(_path, chunk_size=chunk_size)
+
+    assert _graph.edge_count() == 2
+    assert edge_set(_graph) == {("A", "B", 1), ("B", "C", 2)}